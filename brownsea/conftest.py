@@ -1,9 +1,21 @@
 import pytest
+from django.core.cache import cache
 from wagtail.models import Page, Site
 
 from brownsea.factories import HomePageFactory, publish
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from brownsea.core.magic_links import magic_link_usage
+    from brownsea.search.query_log import search_query_log
+
+    # Cached access data describes the tree of whichever test created it.
+    cache.clear()
+    magic_link_usage.clear()
+    search_query_log.clear()
+
+
 @pytest.fixture
 def site_tree(db):
     site = Site.objects.get(is_default_site=True)
@@ -0,0 +1,358 @@
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.http.request import split_domain_port
+from wagtail.contrib.redirects.models import Redirect
+from wagtail.models import Page, PageViewRestriction, Site, get_page_models
+
+from brownsea.core.models import BasePage, PageAccessLevel
+
+# Pages with no explicit setting above them (including the site home) default to logged in only.
+DEFAULT_ACCESS = (PageAccessLevel.LOGGED_IN.value, "")
+
+UPDATE_BATCH_SIZE = 500
+
+ACCESS_INDEX_CACHE_KEY = "brownsea:page-access-index"
+ACCESS_GATE_VERSION_CACHE_KEY = "brownsea:access-gate-version"
+# Changes are invalidated as they're made, but bound how long a cache that missed that can lag.
+ACCESS_INDEX_CACHE_TIMEOUT = 5 * 60
+
+
+def get_access_page_models() -> list[type[BasePage]]:
+    models = [model for model in get_page_models() if issubclass(model, BasePage)]
+    # Multi-table children share their parent's rows, so only query the top-most model.
+    return [model for model in models if not any(other is not model and issubclass(model, other) for other in models)]
+
+
+def resolve_access(access_level: str, path: str, inherited: tuple[str, str]) -> tuple[str, str]:
+    if access_level != PageAccessLevel.INHERIT:
+        return access_level, path
+    return inherited
+
+
+def get_inherited_access(page) -> tuple[str, str]:
+    """Return the (access level, source path) that ``page`` inherits from its parent."""
+    if page.depth <= 2:
+        return DEFAULT_ACCESS
+
+    parent = Page.objects.get(path=page.path[: -Page.steplen]).specific
+    if not isinstance(parent, BasePage):
+        return DEFAULT_ACCESS
+    return parent.effective_access_level, parent.access_source_path
+
+
+def _apply_access(rows, resolved: dict[str, tuple[str, str]]) -> int:
+    """
+    Resolve the effective access for ``rows`` of (model, pk, path, access_level, stored access),
+    walking them in tree order so every parent is resolved before its children, and write back
+    only the rows that changed. ``resolved`` seeds the walk with already known ancestors.
+    """
+    changes = defaultdict(list)
+    for model, pk, path, access_level, stored in sorted(rows, key=lambda row: row[2]):
+        inherited = resolved.get(path[: -Page.steplen], DEFAULT_ACCESS)
+        resolved[path] = access = resolve_access(access_level, path, inherited)
+        if access != stored:
+            changes[model, access].append(pk)
+
+    updated = 0
+    for (model, (effective_access_level, access_source_path)), pks in changes.items():
+        for start in range(0, len(pks), UPDATE_BATCH_SIZE):
+            updated += model.objects.filter(pk__in=pks[start : start + UPDATE_BATCH_SIZE]).update(
+                effective_access_level=effective_access_level,
+                access_source_path=access_source_path,
+            )
+    return updated
+
+
+def _get_access_rows(**filters):
+    rows = []
+    for model in get_access_page_models():
+        for pk, path, access_level, effective_access_level, access_source_path in model.objects.filter(
+            **filters
+        ).values_list("pk", "path", "access_level", "effective_access_level", "access_source_path"):
+            rows.append((model, pk, path, access_level, (effective_access_level, access_source_path)))
+    return rows
+
+
+def update_subtree_access(page, *, inclusive=False) -> int:
+    """
+    Recompute the stored access for the descendants of ``page`` (and ``page`` itself when
+    ``inclusive``) in one query per page type. Returns the number of pages updated.
+    """
+    if inclusive:
+        resolved = {page.path[: -Page.steplen]: get_inherited_access(page)}
+        rows = _get_access_rows(path__startswith=page.path, depth__gte=page.depth)
+    else:
+        resolved = {page.path: (page.effective_access_level, page.access_source_path)}
+        rows = _get_access_rows(path__startswith=page.path, depth__gt=page.depth)
+    return _apply_access(rows, resolved)
+
+
+def backfill_access() -> int:
+    """Compute the stored access for every page in the tree in a single pass."""
+    updated = _apply_access(_get_access_rows(), {})
+    invalidate_access_index()
+    return updated
+
+
+def get_access_index() -> list[tuple[str, str]]:
+    """
+    Return every explicit access setting in the tree as (path, access level) pairs in tree order.
+    Everything else inherits from the nearest entry whose path is a prefix of its own.
+    """
+    index = cache.get(ACCESS_INDEX_CACHE_KEY)
+    if index is None:
+        index = sorted(
+            (path, access_level)
+            for model in get_access_page_models()
+            for path, access_level in model.objects.exclude(access_level=PageAccessLevel.INHERIT).values_list(
+                "path", "access_level"
+            )
+        )
+        cache.set(ACCESS_INDEX_CACHE_KEY, index, ACCESS_INDEX_CACHE_TIMEOUT)
+    return index
+
+
+def invalidate_access_index() -> None:
+    cache.delete(ACCESS_INDEX_CACHE_KEY)
+    invalidate_access_gate()
+
+
+def get_access_gate_version() -> int:
+    version = cache.get(ACCESS_GATE_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(ACCESS_GATE_VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+        version = cache.get(ACCESS_GATE_VERSION_CACHE_KEY)
+    # Without a working cache the gate is rebuilt on every request.
+    return version if version is not None else time.time_ns()
+
+
+def invalidate_access_gate() -> None:
+    cache.set(ACCESS_GATE_VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+
+
+def build_access_gate_map() -> dict[tuple[str, int, bool], list[tuple[str, str | None]]]:
+    """
+    Map each site's (hostname, port, is default) to its (URL path prefix, access level) pairs,
+    in the order they should be matched. Password protected sections come first with no access
+    level, as Wagtail asks for the password before the page decides anything. The rest are
+    longest prefix first, ending with the site root so every URL resolves to an access level.
+    """
+    index = get_access_index()
+    password_paths = list(
+        PageViewRestriction.objects.filter(restriction_type=PageViewRestriction.PASSWORD).values_list(
+            "page__path", flat=True
+        )
+    )
+    url_paths = dict(
+        Page.objects.filter(path__in=[*password_paths, *(path for path, _ in index)]).values_list("path", "url_path")
+    )
+
+    gate_map = {}
+    for site in Site.objects.select_related("root_page"):
+        root_page = site.root_page
+
+        def get_url_prefix(path, root_page=root_page):
+            return url_paths[path][len(root_page.url_path) - 1 :]
+
+        root_access_level = DEFAULT_ACCESS[0]
+        entries = []
+        for path, access_level in index:
+            if root_page.path.startswith(path):
+                root_access_level = access_level
+            elif path.startswith(root_page.path) and path in url_paths:
+                entries.append((get_url_prefix(path), access_level))
+        entries.append(("/", root_access_level))
+        entries.sort(key=lambda entry: len(entry[0]), reverse=True)
+
+        password_entries = [
+            ("/" if root_page.path.startswith(path) else get_url_prefix(path), None)
+            for path in password_paths
+            if root_page.path.startswith(path) or path.startswith(root_page.path)
+        ]
+        gate_map[site.hostname, site.port, site.is_default_site] = password_entries + entries
+    return gate_map
+
+
+def build_redirect_paths() -> dict[tuple[str, int, bool] | None, set[str]]:
+    """
+    Map each site's (hostname, port, is default) to the paths redirected from it, without their
+    query strings, so the gate can leave them to Wagtail's redirect middleware. Redirects for
+    every site are under None.
+    """
+    redirect_paths = defaultdict(set)
+    for old_path, hostname, port, is_default_site in Redirect.objects.values_list(
+        "old_path", "site__hostname", "site__port", "site__is_default_site"
+    ):
+        site = (hostname, port, is_default_site) if hostname is not None else None
+        redirect_paths[site].add(urlparse(old_path).path)
+    return redirect_paths
+
+
+def match_site(sites, hostname: str, port: int):
+    """Pick the site for a hostname and port from ``sites`` the same way Wagtail does, in memory."""
+    ranked = []
+    for site in sites:
+        site_hostname, site_port, is_default_site = site
+        if site_hostname == hostname and site_port == port:
+            ranked.append((0, site))
+        elif site_hostname == hostname and is_default_site:
+            ranked.append((1, site))
+        elif is_default_site:
+            ranked.append((2, site))
+        elif site_hostname == hostname:
+            ranked.append((3, site))
+    ranked.sort(key=lambda match: match[0])
+
+    if not ranked:
+        return None
+    if len(ranked) == 1 or ranked[0][0] in (0, 1):
+        return ranked[0][1]
+    if ranked[0][0] == 2:
+        # A single hostname match wins over the default site.
+        return ranked[len(ranked) == 2][1]
+    return None
+
+
+class AccessGate:
+    """
+    An in-process copy of every site's URL prefixes and their access levels, so a request can be
+    checked before any page is loaded. It is rebuilt whenever the shared gate version changes.
+    """
+
+    def __init__(self):
+        self._state = (None, {}, {})
+
+    def get_access_level(self, request) -> str | None:
+        """
+        Return the access level of the URL of ``request``, or None if it's left to the page,
+        including URLs redirected from, which may 404 into a redirect rather than reach a page.
+        """
+        version = get_access_gate_version()
+        gate_version, gate_map, redirect_paths = self._state
+        if version != gate_version:
+            gate_map = build_access_gate_map()
+            redirect_paths = build_redirect_paths()
+            self._state = (version, gate_map, redirect_paths)
+
+        # Use `_get_raw_host` to avoid ALLOWED_HOSTS checks, as Wagtail does.
+        hostname = split_domain_port(request._get_raw_host())[0]
+        site = match_site(gate_map, hostname, int(request.get_port()))
+        path = urlparse(Redirect.normalise_path(request.path)).path
+        if path in redirect_paths.get(site, ()) or path in redirect_paths.get(None, ()):
+            return None
+        for prefix, access_level in gate_map.get(site, ()):
+            if request.path_info.startswith(prefix):
+                return access_level
+        return None
+
+
+access_gate = AccessGate()
+
+
+def build_visibility_filter(index: list[tuple[str, str]], grant_paths: list[str]) -> Q:
+    """
+    Build a filter on treebeard paths matching the pages an anonymous visitor holding magic
+    link grants for ``grant_paths`` may view.
+    """
+    regions = Q(pk__in=[])
+    for position, (path, access_level) in enumerate(index):
+        if access_level == PageAccessLevel.PUBLIC:
+            prefixes = [path]
+        elif access_level == PageAccessLevel.MAGIC_LINK:
+            if any(path.startswith(grant_path) for grant_path in grant_paths):
+                prefixes = [path]
+            else:
+                prefixes = [grant_path for grant_path in grant_paths if grant_path.startswith(path)]
+        else:
+            continue
+
+        # Explicit settings further down take over their own subtrees. The index is in tree
+        # order, so they immediately follow this entry.
+        nested_paths = []
+        for nested_path, _ in index[position + 1 :]:
+            if not nested_path.startswith(path):
+                break
+            nested_paths.append(nested_path)
+
+        for prefix in prefixes:
+            if any(prefix.startswith(nested_path) for nested_path in nested_paths):
+                continue
+            region = Q(path__startswith=prefix)
+            for nested_path in nested_paths:
+                if nested_path.startswith(prefix):
+                    region &= ~Q(path__startswith=nested_path)
+            regions |= region
+    return regions
+
+
+def get_visibility_filter(request) -> Q:
+    """Return a filter matching the pages the viewer of ``request`` may view."""
+    if request.user.is_authenticated:
+        return Q()
+
+    resolver = get_access_resolver(request)
+    grant_paths = [grant.path for grant in resolver.get_magic_link_grants()]
+    return build_visibility_filter(resolver.get_access_index(), grant_paths)
+
+
+class AccessResolver:
+    """
+    Memoizes access decisions for a single request, so the page, its templates and the
+    admin panels can ask the same question repeatedly without repeating the work.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.hits = 0
+        self.misses = 0
+        self._cache = {}
+
+    def _get(self, key, compute):
+        try:
+            value = self._cache[key]
+        except KeyError:
+            self.misses += 1
+            value = self._cache[key] = compute()
+        else:
+            self.hits += 1
+        return value
+
+    def clear(self):
+        self._cache.clear()
+
+    def get_effective_access_level(self, page) -> str:
+        return self._get(("access_level", page.pk), page.get_effective_access_level)
+
+    def get_access_index(self) -> list[tuple[str, str]]:
+        return self._get(("access_index",), get_access_index)
+
+    def get_magic_link_grants(self):
+        from brownsea.core.magic_links import get_active_session_grants
+
+        return self._get(("magic_link_grants",), lambda: get_active_session_grants(self.request))
+
+    def get_magic_link_grant(self, page):
+        """Return the session's grant that lets it view ``page``, if any."""
+        return self._get(("magic_link_grant", page.pk), lambda: self._get_magic_link_grant(page))
+
+    def _get_magic_link_grant(self, page):
+        if self.get_effective_access_level(page) != PageAccessLevel.MAGIC_LINK:
+            return None
+        return next((grant for grant in self.get_magic_link_grants() if grant.covers(page)), None)
+
+    def has_magic_link_access(self, page) -> bool:
+        return self.get_magic_link_grant(page) is not None
+
+    def can_edit(self, page) -> bool:
+        return self._get(("can_edit", page.pk), lambda: page.permissions_for_user(self.request.user).can_edit())
+
+
+def get_access_resolver(request) -> AccessResolver:
+    resolver = getattr(request, "access_resolver", None)
+    if resolver is None:
+        resolver = request.access_resolver = AccessResolver(request)
+    return resolver
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "brownsea.core"
+
+    def ready(self):
+        from brownsea.core.signal_handlers import register_signal_handlers
+
+        register_signal_handlers()
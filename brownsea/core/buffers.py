@@ -0,0 +1,108 @@
+import atexit
+import logging
+import os
+import threading
+import weakref
+from collections import Counter
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+# Every live counter, for the process's exit and fork hooks registered at the end of the module.
+_counters = weakref.WeakSet()
+
+
+class BufferedCounter:
+    """
+    Counts events in process and writes them to the database in bulk from a background timer,
+    at most ``flush_seconds_setting`` seconds after the first unwritten count, so a request only
+    ever adds to a counter in memory. A failed write is logged and its counts are kept for the
+    next one. Whatever is buffered is written when the process exits, and lost if it dies.
+
+    Subclasses set ``flush_seconds_setting`` and implement ``write()``.
+    """
+
+    flush_seconds_setting: str
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._timer = None
+        _counters.add(self)
+
+    def add(self, key, count: int = 1) -> None:
+        with self._lock:
+            self._counts[key] += count
+            self._start_timer()
+
+    def _start_timer(self) -> None:
+        if self._timer is None:
+            self._timer = threading.Timer(getattr(settings, self.flush_seconds_setting), self._flush_on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush_quietly()
+        finally:
+            # The timer thread's connection would otherwise stay open until the process exits.
+            connections.close_all()
+            with self._lock:
+                if self._counts:
+                    self._start_timer()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts = Counter()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def reset_after_fork(self) -> None:
+        # The parent's lock may have been held by a thread the child doesn't have, so it can't be
+        # taken here. Nor can the timer be cancelled, as its thread didn't come with the fork.
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._timer = None
+
+    def flush(self) -> int:
+        """Write the buffered counts to the database. Returns the number of rows updated."""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        if not counts:
+            return 0
+
+        try:
+            return self.write(counts)
+        except DatabaseError:
+            with self._lock:
+                self._counts.update(counts)
+            raise
+
+    def flush_quietly(self) -> None:
+        try:
+            self.flush()
+        except DatabaseError:
+            logger.exception("Failed to write buffered counts from %s", type(self).__name__)
+
+    def write(self, counts: Counter) -> int:
+        raise NotImplementedError
+
+
+def flush_all() -> None:
+    for counter in list(_counters):
+        counter.flush_quietly()
+
+
+def reset_all_after_fork() -> None:
+    # A forked worker would otherwise write the parent's counts a second time.
+    for counter in list(_counters):
+        counter.reset_after_fork()
+
+
+atexit.register(flush_all)
+os.register_at_fork(after_in_child=reset_all_after_fork)
@@ -0,0 +1,29 @@
+from django import forms
+
+MAX_MAGIC_LINKS_PER_PAGE = 100
+
+
+class MagicLinkBulkCreateForm(forms.Form):
+    count = forms.IntegerField(
+        min_value=1,
+        max_value=MAX_MAGIC_LINKS_PER_PAGE,
+        initial=1,
+        help_text="How many links to create for each page.",
+    )
+    label = forms.CharField(
+        max_length=250,
+        required=False,
+        help_text="Links are numbered when more than one is created for a page.",
+    )
+    expires_at = forms.DateTimeField(required=False, label="Expires at")
+
+
+class MagicLinkBulkRevokeForm(forms.Form):
+    page = forms.IntegerField(required=False)
+    created_by = forms.IntegerField(required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get("page") is None and cleaned_data.get("created_by") is None:
+            raise forms.ValidationError("Choose a page or a user whose links should be revoked.")
+        return cleaned_data
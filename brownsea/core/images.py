@@ -0,0 +1,50 @@
+from collections import defaultdict
+from io import BytesIO
+
+from wagtail.images import get_image_model
+from wagtail.images.models import Filter, SourceImageIOError
+
+
+def prefetch_renditions(objects, *filter_specs, field="image"):
+    """
+    Load the renditions of ``filter_specs`` for the ``field`` image of each of ``objects`` in one
+    query, so the ``{% image %}`` tags rendering them need no queries of their own. Renditions
+    that don't exist yet are generated here and inserted together in one more query, rather than
+    one at a time while the template renders.
+    """
+    images = defaultdict(list)
+    for obj in objects:
+        if (image := getattr(obj, field)) is not None:
+            images[image.pk].append(image)
+    if not images:
+        return
+
+    rendition_model = get_image_model().get_rendition_model()
+    renditions = defaultdict(list)
+    for rendition in rendition_model.objects.filter(image_id__in=images, filter_spec__in=filter_specs):
+        renditions[rendition.image_id].append(rendition)
+
+    to_create = []
+    for image_id, (image, *_) in images.items():
+        image.prefetched_renditions = renditions[image_id]
+        filters = list(dict.fromkeys(image.clean_filter_for_svg(Filter(spec=spec)) for spec in filter_specs))
+        found = image.find_existing_renditions(*filters)
+        missing = [image_filter for image_filter in filters if image_filter not in found]
+        if not missing:
+            continue
+        try:
+            with image.open_file() as file:
+                source = file.read()
+        except SourceImageIOError:
+            # The image tag shows a placeholder for a missing file.
+            continue
+        to_create += [image.generate_rendition_instance(image_filter, BytesIO(source)) for image_filter in missing]
+
+    # Should another process have created any since they were loaded, its rows are kept and these
+    # are only used for this render.
+    for rendition in rendition_model.objects.bulk_create(to_create, ignore_conflicts=True):
+        renditions[rendition.image_id].append(rendition)
+
+    for image_id, instances in images.items():
+        for image in instances:
+            image.prefetched_renditions = list(renditions[image_id])
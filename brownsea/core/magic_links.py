@@ -1,12 +1,26 @@
+import csv
+import time
 import uuid
+from collections import Counter
+from dataclasses import dataclass
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.signing import BadSignature, Signer
+from django.db.models import Case, F, When
+from django.utils import timezone
+from wagtail.models import Site
 
+from brownsea.core.access import get_access_resolver
+from brownsea.core.buffers import BufferedCounter
 from brownsea.core.models import PageAccessLevel, PageMagicLink
 
-MAGIC_LINK_SESSION_KEY = "brownsea_magic_link_ids"
+MAGIC_LINK_SESSION_KEY = "brownsea_magic_link_grants"
+LEGACY_MAGIC_LINK_SESSION_KEY = "brownsea_magic_link_ids"
 MAGIC_LINK_SIGNER_SALT = "brownsea.page-magic-link"
+MAGIC_LINK_GRANT_SALT = "brownsea.page-magic-link-grant"
+MAGIC_LINK_GENERATION_CACHE_PREFIX = "brownsea:magic-link-generation"
+USAGE_FLUSH_BATCH_SIZE = 500
 
 
 def get_signer() -> Signer:
@@ -35,8 +49,7 @@ def get_magic_link_for_token(token: str) -> PageMagicLink | None:
         return None
 
 
-def build_magic_link_url(magic_link: PageMagicLink, request=None) -> str:
-    page = magic_link.page
+def get_page_share_url(page, request=None) -> str:
     page_url = page.get_full_url(request)
 
     if not page_url and request is not None:
@@ -49,6 +62,13 @@ def build_magic_link_url(magic_link: PageMagicLink, request=None) -> str:
         if relative_url:
             page_url = f"{settings.WAGTAILADMIN_BASE_URL.rstrip('/')}{relative_url}"
 
+    return page_url or ""
+
+
+def build_magic_link_url(magic_link: PageMagicLink, request=None, page_url: str | None = None) -> str:
+    if page_url is None:
+        page_url = get_page_share_url(magic_link.page, request)
+
     token = sign_magic_link(magic_link)
     if not page_url:
         return f"?access={token}"
@@ -57,36 +77,203 @@ def build_magic_link_url(magic_link: PageMagicLink, request=None) -> str:
     return f"{page_url}{separator}access={token}"
 
 
-def get_session_magic_link_ids(request) -> list[str]:
-    return list(request.session.get(MAGIC_LINK_SESSION_KEY, []))
+def get_magic_links_for_display(page, request=None) -> tuple[list[dict], list[PageMagicLink]]:
+    """
+    Return the active links for ``page`` with their share URLs, and its inactive links,
+    from a single query. The page's own URL is only resolved once for all of them.
+    """
+    active_links, inactive_links = [], []
+    for magic_link in PageMagicLink.objects.filter(page=page):
+        (active_links if magic_link.is_active else inactive_links).append(magic_link)
+
+    page_url = get_page_share_url(page, request) if active_links else ""
+    return [
+        {"link": magic_link, "share_url": build_magic_link_url(magic_link, request, page_url)}
+        for magic_link in active_links
+    ], inactive_links
+
+
+def create_magic_links(pages, *, count=1, label="", expires_at=None, created_by=None) -> list[PageMagicLink]:
+    """Create ``count`` links for each of ``pages`` in a single INSERT, numbering the labels if needed."""
+    magic_links = [
+        PageMagicLink(
+            page=page,
+            label=f"{label} #{number}".strip() if count > 1 else label,
+            expires_at=expires_at,
+            created_by=created_by,
+        )
+        for page in pages
+        for number in range(1, count + 1)
+    ]
+    return PageMagicLink.objects.bulk_create(magic_links)
+
+
+def get_magic_links_under(page):
+    return PageMagicLink.objects.filter(page__path__startswith=page.path)
+
+
+def revoke_magic_links(magic_links) -> int:
+    """Revoke every unrevoked link in the ``magic_links`` queryset with a single UPDATE."""
+    revoked = magic_links.filter(revoked_at__isnull=True).update(revoked_at=timezone.now())
+    if revoked:
+        # Updates skip the signals that would otherwise bump the link's site.
+        bump_all_magic_link_generations()
+    return revoked
+
+
+def sweep_magic_links(cutoff, *, batch_size=1000) -> int:
+    """
+    Delete the links that were revoked or expired before ``cutoff``, ``batch_size`` at a time
+    so no single statement holds locks on a large part of the table.
+    """
+    deleted = 0
+    retired_links = PageMagicLink.objects.retired_before(cutoff).order_by("pk").values_list("pk", flat=True)
+    while pks := list(retired_links[:batch_size]):
+        deleted += PageMagicLink.objects.filter(pk__in=pks).delete()[0]
+    return deleted
+
+
+def write_magic_links_csv(magic_links, output, request=None) -> None:
+    """
+    Write the share URLs of ``magic_links`` to ``output``, resolving each page's URL only once.
+    The links should come with their pages, e.g. from ``select_related("page")``.
+    """
+    writer = csv.writer(output)
+    writer.writerow(["Page", "Label", "Created", "Expires", "Share URL"])
+
+    page_urls = {}
+    for magic_link in magic_links:
+        if magic_link.page_id not in page_urls:
+            page_urls[magic_link.page_id] = get_page_share_url(magic_link.page, request)
+        writer.writerow(
+            [
+                magic_link.page.title,
+                magic_link.label,
+                magic_link.created_at.isoformat(),
+                magic_link.expires_at.isoformat() if magic_link.expires_at else "",
+                build_magic_link_url(magic_link, request, page_urls[magic_link.page_id]),
+            ]
+        )
+
+
+def get_generation_cache_key(site) -> str:
+    return f"{MAGIC_LINK_GENERATION_CACHE_PREFIX}:{site.pk if site is not None else 'none'}"
+
+
+def get_magic_link_generation(site) -> int:
+    """
+    Return the site's revocation generation. Grants signed with an older generation are
+    re-checked against the database. A missing counter (e.g. after cache eviction) is
+    re-seeded from the clock so it can never match a generation handed out before.
+    """
+    key = get_generation_cache_key(site)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    # Without a working cache every grant is treated as stale and checked against the database.
+    return generation if generation is not None else time.time_ns()
+
+
+def bump_magic_link_generation(site) -> None:
+    key = get_generation_cache_key(site)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
 
 
-def grant_magic_link_access(request, magic_link: PageMagicLink) -> None:
-    link_ids = get_session_magic_link_ids(request)
-    token_id = str(magic_link.token_id)
-    if token_id not in link_ids:
-        link_ids.append(token_id)
-        request.session[MAGIC_LINK_SESSION_KEY] = link_ids
+def bump_all_magic_link_generations() -> None:
+    for site in Site.objects.all():
+        bump_magic_link_generation(site)
 
 
-def get_active_session_magic_links(request) -> list[PageMagicLink]:
-    active_links = []
-    active_ids = []
+@dataclass(frozen=True)
+class MagicLinkGrant:
+    """A magic link redeemed by this session, checked in memory while its generation is current."""
 
-    for token_id in get_session_magic_link_ids(request):
+    token_id: str
+    path: str
+    expires_at: int | None
+    generation: int
+
+    @classmethod
+    def for_magic_link(cls, magic_link: PageMagicLink, generation: int) -> "MagicLinkGrant":
+        expires_at = magic_link.expires_at
+        return cls(
+            token_id=str(magic_link.token_id),
+            path=magic_link.page.path,
+            expires_at=int(expires_at.timestamp()) if expires_at is not None else None,
+            generation=generation,
+        )
+
+    @classmethod
+    def unsign(cls, value: str) -> "MagicLinkGrant | None":
         try:
-            magic_link = PageMagicLink.objects.select_related("page").get(token_id=token_id)
-        except PageMagicLink.DoesNotExist:
-            continue
+            return cls(*Signer(salt=MAGIC_LINK_GRANT_SALT).unsign_object(value))
+        except (BadSignature, TypeError, ValueError):
+            return None
+
+    def sign(self) -> str:
+        return Signer(salt=MAGIC_LINK_GRANT_SALT).sign_object(
+            [self.token_id, self.path, self.expires_at, self.generation], compress=True
+        )
+
+    @property
+    def is_expired(self) -> bool:
+        return self.expires_at is not None and time.time() >= self.expires_at
 
-        if magic_link.is_active:
-            active_links.append(magic_link)
-            active_ids.append(token_id)
+    def covers(self, page) -> bool:
+        return page.path.startswith(self.path)
 
-    if active_ids != get_session_magic_link_ids(request):
-        request.session[MAGIC_LINK_SESSION_KEY] = active_ids
 
-    return active_links
+def _save_session_grants(request, grants: list[MagicLinkGrant]) -> None:
+    signed_grants = [grant.sign() for grant in grants]
+    if signed_grants != request.session.get(MAGIC_LINK_SESSION_KEY, []):
+        request.session[MAGIC_LINK_SESSION_KEY] = signed_grants
+    # Sessions from before grants were signed only hold the link ids.
+    request.session.pop(LEGACY_MAGIC_LINK_SESSION_KEY, None)
+
+
+def grant_magic_link_access(request, magic_link: PageMagicLink) -> None:
+    generation = get_magic_link_generation(Site.find_for_request(request))
+    grant = MagicLinkGrant.for_magic_link(magic_link, generation)
+    grants = [existing for existing in get_active_session_grants(request) if existing.token_id != grant.token_id]
+    _save_session_grants(request, [*grants, grant])
+    get_access_resolver(request).clear()
+
+
+def get_active_session_grants(request) -> list[MagicLinkGrant]:
+    signed_grants = request.session.get(MAGIC_LINK_SESSION_KEY, [])
+    legacy_ids = request.session.get(LEGACY_MAGIC_LINK_SESSION_KEY, [])
+    if not signed_grants and not legacy_ids:
+        return []
+
+    generation = get_magic_link_generation(Site.find_for_request(request))
+    token_ids = list(legacy_ids)
+    stale_ids = list(legacy_ids)
+    grants_by_id = {}
+    for grant in filter(None, map(MagicLinkGrant.unsign, signed_grants)):
+        token_ids.append(grant.token_id)
+        if grant.generation != generation:
+            stale_ids.append(grant.token_id)
+        elif not grant.is_expired:
+            grants_by_id[grant.token_id] = grant
+
+    if stale_ids:
+        # Something was revoked since these grants were signed, so re-check them all at once.
+        for magic_link in (
+            PageMagicLink.objects.active()
+            .filter(token_id__in=stale_ids)
+            .select_related("page")
+            .only("token_id", "expires_at", "revoked_at", "page__path")
+        ):
+            grant = MagicLinkGrant.for_magic_link(magic_link, generation)
+            grants_by_id[grant.token_id] = grant
+
+    grants = [grants_by_id[token_id] for token_id in dict.fromkeys(token_ids) if token_id in grants_by_id]
+    _save_session_grants(request, grants)
+    return grants
 
 
 def magic_link_covers_page(magic_link: PageMagicLink, page) -> bool:
@@ -94,14 +281,7 @@ def magic_link_covers_page(magic_link: PageMagicLink, page) -> bool:
 
 
 def has_magic_link_access(request, page) -> bool:
-    if page.get_effective_access_level() != PageAccessLevel.MAGIC_LINK:
-        return False
-
-    for magic_link in get_active_session_magic_links(request):
-        if magic_link_covers_page(magic_link, page):
-            return True
-
-    return False
+    return get_access_resolver(request).has_magic_link_access(page)
 
 
 def redeem_magic_link_token(request, token: str, page) -> bool:
@@ -112,8 +292,47 @@ def redeem_magic_link_token(request, token: str, page) -> bool:
     if not magic_link_covers_page(magic_link, page):
         return False
 
-    if page.get_effective_access_level() != PageAccessLevel.MAGIC_LINK:
+    if get_access_resolver(request).get_effective_access_level(page) != PageAccessLevel.MAGIC_LINK:
         return False
 
     grant_magic_link_access(request, magic_link)
+    magic_link_usage.record_redemption(str(magic_link.token_id))
     return True
+
+
+class MagicLinkUsageBuffer(BufferedCounter):
+    """
+    Counts magic link redemptions and views in process, and adds them to the database in one
+    UPDATE per batch of links from a background timer every APP_MAGIC_LINK_USAGE_FLUSH_SECONDS,
+    so serving a page never waits on a write.
+    """
+
+    flush_seconds_setting = "APP_MAGIC_LINK_USAGE_FLUSH_SECONDS"
+    fields = ("redemption_count", "view_count")
+
+    def record_redemption(self, token_id: str) -> None:
+        self.add((token_id, "redemption_count"))
+
+    def record_view(self, token_id: str) -> None:
+        self.add((token_id, "view_count"))
+
+    def write(self, counts: Counter) -> int:
+        token_ids = sorted({token_id for token_id, _ in counts})
+        now = timezone.now()
+        updated = 0
+        for start in range(0, len(token_ids), USAGE_FLUSH_BATCH_SIZE):
+            batch = token_ids[start : start + USAGE_FLUSH_BATCH_SIZE]
+            increments = {
+                field: F(field)
+                + Case(
+                    *(When(token_id=token_id, then=counts[token_id, field]) for token_id in batch),
+                    default=0,
+                )
+                for field in self.fields
+                if any(counts[token_id, field] for token_id in batch)
+            }
+            updated += PageMagicLink.objects.filter(token_id__in=batch).update(**increments, last_used_at=now)
+        return updated
+
+
+magic_link_usage = MagicLinkUsageBuffer()
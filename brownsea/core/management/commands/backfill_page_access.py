@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from brownsea.core.access import backfill_access
+
+
+class Command(BaseCommand):
+    help = "Compute the stored effective access level for every page in the tree."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = backfill_access()
+        self.stdout.write(f"Updated the effective access level of {updated} page(s).")
@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from brownsea.core.magic_links import sweep_magic_links
+from brownsea.core.models import PageMagicLink
+
+
+class Command(BaseCommand):
+    help = "Delete magic links that were revoked or expired longer ago than the retention window."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=settings.APP_MAGIC_LINK_RETENTION_DAYS,
+            help="Keep retired links for this many days (default: %(default)s).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000, help="Links to delete per query.")
+        parser.add_argument("--dry-run", action="store_true", help="Report how many links would be deleted.")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["retention_days"])
+
+        if options["dry_run"]:
+            count = PageMagicLink.objects.retired_before(cutoff).count()
+            self.stdout.write(f"Would delete {count} magic link(s) retired before {cutoff:%Y-%m-%d %H:%M}.")
+            return
+
+        deleted = sweep_magic_links(cutoff, batch_size=options["batch_size"])
+        self.stdout.write(f"Deleted {deleted} magic link(s) retired before {cutoff:%Y-%m-%d %H:%M}.")
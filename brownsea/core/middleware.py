@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.contrib.auth.views import redirect_to_login
+from wagtail.views import serve
+
+from brownsea.core.access import access_gate
+from brownsea.core.models import PageAccessLevel
+
+
+class AccessGateMiddleware:
+    """
+    Redirect anonymous visitors to the login page before Wagtail loads the page, when the URL
+    falls in a logged-in only part of the site. Public and magic link pages are left for
+    BasePage.serve() to decide.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if view_func is not serve or request.user.is_authenticated:
+            return None
+
+        # Magic link tokens are redeemed by the page itself.
+        if "access" in request.GET:
+            return None
+
+        access_level = access_gate.get_access_level(request)
+        if access_level == PageAccessLevel.LOGGED_IN:
+            return redirect_to_login(request.get_full_path(), settings.LOGIN_URL)
+        return None
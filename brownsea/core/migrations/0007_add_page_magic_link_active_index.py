@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0006_add_theme_settings"),
+        ("wagtailcore", "0097_baselogentry_uuid_action_timestamp_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="pagemagiclink",
+            index=models.Index(fields=["page", "revoked_at", "expires_at"], name="core_magiclink_page_active"),
+        ),
+    ]
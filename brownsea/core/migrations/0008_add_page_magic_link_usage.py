@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0007_add_page_magic_link_active_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pagemagiclink",
+            name="last_used_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="pagemagiclink",
+            name="redemption_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="pagemagiclink",
+            name="view_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
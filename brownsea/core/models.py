@@ -4,7 +4,6 @@ from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Submit
 from django.conf import settings
 from django.contrib.auth.views import redirect_to_login
-from django.core.paginator import Paginator
 from django.db import models
 from django.forms import ValidationError
 from django.shortcuts import redirect, render
@@ -12,10 +11,12 @@ from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from wagtail.admin.panels import FieldPanel, HelpPanel, MultiFieldPanel, ObjectList, TabbedInterface
 from wagtail.contrib.settings.models import BaseSiteSetting, register_setting
-from wagtail.models import Page, PreviewableMixin
+from wagtail.models import Page, PageManager, PreviewableMixin
+from wagtail.query import PageQuerySet
 from wagtail.search import index
 
 from brownsea.core.blocks import HeadingBlock
+from brownsea.core.pagination import CountlessPaginator
 from brownsea.core.panels import MagicLinksPanel
 from brownsea.core.themes import THEMES, get_theme
 
@@ -34,6 +35,10 @@ class PageMagicLinkQuerySet(models.QuerySet):
             models.Q(expires_at__isnull=True) | models.Q(expires_at__gt=now)
         )
 
+    def retired_before(self, cutoff):
+        """Links that were revoked or expired before ``cutoff``."""
+        return self.filter(models.Q(revoked_at__lt=cutoff) | models.Q(expires_at__lt=cutoff))
+
 
 class PageMagicLink(models.Model):
     page = models.ForeignKey(
@@ -53,11 +58,19 @@ class PageMagicLink(models.Model):
         on_delete=models.SET_NULL,
         related_name="+",
     )
+    # Usage is counted in memory and added here in batches, so these can lag slightly behind.
+    redemption_count = models.PositiveIntegerField(default=0, editable=False)
+    view_count = models.PositiveIntegerField(default=0, editable=False)
+    last_used_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     objects = PageMagicLinkQuerySet.as_manager()
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Serves active() for a page's links without reading the ones it has long since retired.
+            models.Index(fields=["page", "revoked_at", "expires_at"], name="core_magiclink_page_active"),
+        ]
 
     def __str__(self):
         return self.label or f"Magic link for {self.page.title}"
@@ -75,6 +88,18 @@ class PageMagicLink(models.Model):
         self.save(update_fields=["revoked_at"])
 
 
+# Search weights, highest first: the title (boosted by Wagtail), the introduction, then everything
+# else. PostgreSQL stores these as the A, B and D weights of each page's tsvector.
+INTRODUCTION_SEARCH_BOOST = 1.5
+
+
+class BasePageQuerySet(PageQuerySet):
+    def visible_to(self, request):
+        from brownsea.core.access import get_visibility_filter
+
+        return self.filter(get_visibility_filter(request))
+
+
 class BasePage(Page):
     show_in_menus_default = True
 
@@ -83,6 +108,18 @@ class BasePage(Page):
         choices=PageAccessLevel.choices,
         default=PageAccessLevel.INHERIT,
     )
+    # Resolved from the nearest ancestor with an explicit access level, so that serving a page
+    # doesn't need to walk the tree. Kept up to date by save(), moves and the backfill command.
+    effective_access_level = models.CharField(
+        max_length=20,
+        choices=PageAccessLevel.choices,
+        default=PageAccessLevel.LOGGED_IN,
+        editable=False,
+        db_index=True,
+    )
+    access_source_path = models.CharField(max_length=255, blank=True, editable=False)
+
+    objects = PageManager.from_queryset(BasePageQuerySet)()
 
     promote_panels = Page.promote_panels
     settings_panels = Page.settings_panels
@@ -121,17 +158,46 @@ class BasePage(Page):
 
         cls.edit_handler = TabbedInterface(tabs, base_form_class=getattr(cls, "base_form_class", None))
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "access_level" not in update_fields:
+            return super().save(*args, **kwargs)
+
+        from brownsea.core.access import (
+            get_inherited_access,
+            invalidate_access_index,
+            resolve_access,
+            update_subtree_access,
+        )
+
+        stored_access = (self.effective_access_level, self.access_source_path)
+        self.effective_access_level, self.access_source_path = resolve_access(
+            self.access_level, self.path, get_inherited_access(self)
+        )
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "effective_access_level", "access_source_path"}
+
+        result = super().save(*args, **kwargs)
+        if stored_access != (self.effective_access_level, self.access_source_path):
+            invalidate_access_index()
+            if self.numchild:
+                update_subtree_access(self)
+        return result
+
+    def with_content_json(self, content):
+        obj = super().with_content_json(content)
+        # The stored access belongs to the page's position in the tree, not to a revision.
+        obj.effective_access_level = self.effective_access_level
+        obj.access_source_path = self.access_source_path
+        return obj
+
     def get_effective_access_level(self):
-        for page in reversed(self.specific.get_ancestors(inclusive=True)):
-            if page.is_root():
-                continue
-            specific_page = page.specific
-            if specific_page.access_level != PageAccessLevel.INHERIT:
-                return specific_page.access_level
-        return PageAccessLevel.LOGGED_IN
+        return self.effective_access_level
 
     def allow_anonymous_access(self, request):
-        effective_access = self.get_effective_access_level()
+        from brownsea.core.access import get_access_resolver
+
+        effective_access = get_access_resolver(request).get_effective_access_level(self)
         if effective_access == PageAccessLevel.PUBLIC:
             return True
         if effective_access == PageAccessLevel.MAGIC_LINK:
@@ -151,6 +217,13 @@ class BasePage(Page):
 
             if not self.allow_anonymous_access(request):
                 return redirect_to_login(request.get_full_path(), settings.LOGIN_URL)
+
+            from brownsea.core.access import get_access_resolver
+            from brownsea.core.magic_links import magic_link_usage
+
+            grant = get_access_resolver(request).get_magic_link_grant(self)
+            if grant is not None:
+                magic_link_usage.record_view(grant.token_id)
         return super().serve(request, *args, **kwargs)
 
     def serve_password_required_response(self, request, form, action_url):
@@ -172,19 +245,25 @@ class AbstractIndexPage(BasePage):
         FieldPanel("introduction"),
         HelpPanel("All child pages will be listed."),
     ]
-    search_fields = BasePage.search_fields + [index.SearchField("introduction")]
+    search_fields = BasePage.search_fields + [index.SearchField("introduction", boost=INTRODUCTION_SEARCH_BOOST)]
 
     def get_context(self, request):
         context = super().get_context(request)
 
-        child_pages = self.get_children().live().filter(show_in_menus=True)
+        from brownsea.core.access import get_visibility_filter
 
-        page_number = request.GET.get("page")
-        paginator = context["sub_pages"] = Paginator(
-            child_pages,
-            per_page=settings.APP_SEARCH_RESULTS_PER_PAGE,
+        child_pages = (
+            self.get_children()
+            .live()
+            .filter(show_in_menus=True)
+            .filter(get_visibility_filter(request))
+            .defer_streamfields()
+            .specific()
         )
 
+        page_number = request.GET.get("page")
+        paginator = CountlessPaginator(child_pages, per_page=settings.APP_SEARCH_RESULTS_PER_PAGE)
+
         return {
             **context,
             "sub_pages": paginator.get_page(page_number),
@@ -5,11 +5,31 @@ from brownsea.core.views import magic_links as magic_links_views
 app_name = "core"
 
 urlpatterns = [
+    path(
+        "magic-links/bulk/create/",
+        magic_links_views.magic_links_bulk_create,
+        name="magic_links_bulk_create",
+    ),
+    path(
+        "magic-links/bulk/revoke/",
+        magic_links_views.magic_links_bulk_revoke,
+        name="magic_links_bulk_revoke",
+    ),
+    path(
+        "magic-links/export/",
+        magic_links_views.magic_links_export,
+        name="magic_links_export",
+    ),
     path(
         "magic-links/<int:page_id>/",
         magic_links_views.magic_links_panel,
         name="magic_links_panel",
     ),
+    path(
+        "magic-links/<int:page_id>/admin-panel/",
+        magic_links_views.magic_links_admin_panel,
+        name="magic_links_admin_panel",
+    ),
     path(
         "magic-links/<int:page_id>/create/",
         magic_links_views.magic_links_create,
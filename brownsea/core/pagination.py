@@ -0,0 +1,161 @@
+import collections.abc
+import math
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+
+
+class CountlessPaginator:
+    """
+    A paginator that fetches one row past the requested page to tell whether there is a next one,
+    instead of counting every row first. ``count`` is only known when it is passed in (e.g. for a
+    list already in memory) or once the last page has been reached, so templates must allow for
+    ``count`` and ``num_pages`` being None.
+    """
+
+    def __init__(self, object_list, per_page, *, count=None):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.count = count
+
+    @property
+    def num_pages(self) -> int | None:
+        if self.count is None:
+            return None
+        return max(1, math.ceil(self.count / self.per_page))
+
+    @property
+    def page_range(self) -> range:
+        return range(1, (self.num_pages or 0) + 1)
+
+    def get_page(self, number) -> "CountlessPage":
+        """Return the page for ``number``, falling back to the first or last page like Django's get_page."""
+        try:
+            number = max(int(number), 1)
+        except (TypeError, ValueError):
+            number = 1
+        if self.num_pages is not None:
+            number = min(number, self.num_pages)
+
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and number > 1:
+            # Past the end, which is rare enough to count the rows to find the last page.
+            self.count = self.object_list.count() if isinstance(self.object_list, QuerySet) else len(self.object_list)
+            return self.get_page(self.num_pages)
+
+        has_next = len(rows) > self.per_page
+        if not has_next:
+            self.count = bottom + len(rows)
+        return CountlessPage(rows[: self.per_page], number, self, has_next=has_next)
+
+
+class CountlessPage(collections.abc.Sequence):
+    def __init__(self, object_list, number, paginator, *, has_next):
+        self.object_list = object_list
+        self.number = number
+        self.paginator = paginator
+        self._has_next = has_next
+
+    def __repr__(self):
+        return f"<Page {self.number}>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self.number > 1
+
+    def has_other_pages(self) -> bool:
+        return self.has_previous() or self.has_next()
+
+    def next_page_number(self) -> int:
+        return self.number + 1
+
+    def previous_page_number(self) -> int:
+        return self.number - 1
+
+    def start_index(self) -> int:
+        if not self.object_list:
+            return 0
+        return (self.number - 1) * self.paginator.per_page + 1
+
+    def end_index(self) -> int:
+        return (self.number - 1) * self.paginator.per_page + len(self.object_list)
+
+
+class KeysetPaginator:
+    """
+    Pages through a queryset newest first by ``field`` then primary key, starting each page from
+    a cursor naming the last row seen rather than an offset. With an index on (field, pk) every
+    page costs the same however deep it is. Rows must have a value for ``field``.
+    """
+
+    def __init__(self, queryset, per_page, *, field):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.field = field
+
+    def encode_cursor(self, obj) -> str:
+        return f"{getattr(obj, self.field).isoformat()}_{obj.pk}"
+
+    def decode_cursor(self, cursor):
+        """Return the (field value, pk) a cursor names, or None if it isn't a valid cursor."""
+        try:
+            value, pk = cursor.rsplit("_", 1)
+            return self.queryset.model._meta.get_field(self.field).to_python(value), int(pk)
+        except (AttributeError, ValueError, ValidationError):
+            return None
+
+    def get_page(self, *, after=None, before=None) -> "KeysetPage":
+        """Return the page following the ``after`` cursor, or leading up to the ``before`` cursor."""
+        if before and (position := self.decode_cursor(before)):
+            value, pk = position
+            rows = list(
+                self.queryset.filter(Q((self.field, value), pk__gt=pk) | Q((f"{self.field}__gt", value))).order_by(
+                    self.field, "pk"
+                )[: self.per_page + 1]
+            )
+            has_previous = len(rows) > self.per_page
+            return KeysetPage(rows[: self.per_page][::-1], self, has_previous=has_previous, has_next=True)
+
+        position = self.decode_cursor(after) if after else None
+        queryset = self.queryset
+        if position:
+            value, pk = position
+            queryset = queryset.filter(Q((self.field, value), pk__lt=pk) | Q((f"{self.field}__lt", value)))
+        rows = list(queryset.order_by(f"-{self.field}", "-pk")[: self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        return KeysetPage(rows[: self.per_page], self, has_previous=position is not None, has_next=has_next)
+
+
+class KeysetPage(collections.abc.Sequence):
+    def __init__(self, object_list, paginator, *, has_previous, has_next):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_previous = has_previous
+        self._has_next = has_next
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self._has_next and bool(self.object_list)
+
+    def has_previous(self) -> bool:
+        return self._has_previous and bool(self.object_list)
+
+    def next_cursor(self) -> str:
+        return self.paginator.encode_cursor(self.object_list[-1])
+
+    def previous_cursor(self) -> str:
+        return self.paginator.encode_cursor(self.object_list[0])
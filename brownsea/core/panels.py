@@ -12,38 +12,26 @@ class MagicLinksPanel(Panel):
         template_name = "wagtailadmin/panels/magic_links_panel.html"
 
         def is_shown(self):
+            from brownsea.core.access import get_access_resolver
             from brownsea.core.models import PageAccessLevel
 
             if not self.instance.pk:
                 return False
 
-            specific_page = self.instance.specific
-            if not hasattr(specific_page, "get_effective_access_level"):
+            if not hasattr(self.instance, "get_effective_access_level"):
                 return False
 
-            return specific_page.get_effective_access_level() == PageAccessLevel.MAGIC_LINK
+            access_level = get_access_resolver(self.request).get_effective_access_level(self.instance)
+            return access_level == PageAccessLevel.MAGIC_LINK
 
         def get_context_data(self, parent_context=None):
-            from brownsea.core.magic_links import build_magic_link_url
-            from brownsea.core.models import PageMagicLink
-
+            # The links are loaded by the panel itself once the editor is open.
             context = super().get_context_data(parent_context)
             page = self.instance
-            magic_links = PageMagicLink.objects.filter(page=page)
-            active_links = list(magic_links.active())
-            inactive_links = [link for link in magic_links if not link.is_active]
-
             context.update(
                 {
                     "page": page,
-                    "active_links": [
-                        {
-                            "link": link,
-                            "share_url": build_magic_link_url(link, self.request),
-                        }
-                        for link in active_links
-                    ],
-                    "inactive_links": inactive_links,
+                    "links_url": reverse("core:magic_links_admin_panel", args=[page.id]),
                     "create_url": reverse("core:magic_links_create", args=[page.id]),
                 }
             )
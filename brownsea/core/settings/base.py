@@ -24,6 +24,11 @@ env = environ.Env(
     WAGTAIL_SITE_NAME=(str, "Brownsea Intranet CMS"),
     APP_SHOW_MENU_WHEN_UNAUTHENTICATED=(bool, False),
     APP_SEARCH_RESULTS_PER_PAGE=(int, 10),
+    APP_MAGIC_LINK_RETENTION_DAYS=(int, 90),
+    APP_MAGIC_LINK_USAGE_FLUSH_SECONDS=(int, 60),
+    APP_SEARCH_QUERY_LOG_FLUSH_SECONDS=(int, 60),
+    SEARCH_CONFIG=(str, "english"),
+    SEARCH_INDEX_QUEUE=(bool, False),
     SSO_GOOGLE_ENABLED=(bool, False),
     SSO_ENABLE_PASSWORD_MANAGEMENT=(bool, True),
 )
@@ -55,6 +60,7 @@ INSTALLED_APPS = [
     "crispy_bootstrap5",
     "wagtail.contrib.forms",
     "wagtail.contrib.redirects",
+    "wagtail.contrib.search_promotions",
     "wagtail.contrib.settings",
     "wagtail.contrib.table_block",
     "wagtail.embeds",
@@ -85,6 +91,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "brownsea.core.middleware.AccessGateMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "wagtail.contrib.redirects.middleware.RedirectMiddleware",
@@ -120,6 +127,14 @@ WSGI_APPLICATION = "brownsea.core.wsgi.application"
 
 DATABASES = {"default": dj_database_url.config(conn_max_age=600, default=env("DATABASE_URL"))}
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Magic link revocations and access changes are signalled through the cache, so every worker
+# must share it. Production defaults to the database cache (see production.py); local memory is
+# only safe with a single process, as with runserver.
+
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -230,9 +245,15 @@ WAGTAILADMIN_NOTIFICATION_INCLUDE_SUPERUSERS = False
 
 # Search
 # https://docs.wagtail.org/en/stable/topics/search/backends.html
+# On PostgreSQL this stores weighted tsvectors behind GIN indexes and ranks in SQL. SQLite uses
+# its FTS5 tables instead, and ignores SEARCH_CONFIG. Run `update_index` after changing boosts.
+# With SEARCH_INDEX_QUEUE, saves only queue the object and `process_search_index_queue` indexes
+# them in batches, so it must be kept running. Rebuild in parallel with `rebuild_search_index`.
 WAGTAILSEARCH_BACKENDS = {
     "default": {
         "BACKEND": "wagtail.search.backends.database",
+        "SEARCH_CONFIG": env("SEARCH_CONFIG"),
+        "AUTO_UPDATE": not env("SEARCH_INDEX_QUEUE"),
     }
 }
 
@@ -307,3 +328,6 @@ LOGOUT_REDIRECT_URL = env("LOGOUT_REDIRECT_URL")
 WAGTAIL_SITE_NAME = env("WAGTAIL_SITE_NAME")
 APP_SHOW_MENU_WHEN_UNAUTHENTICATED = env("APP_SHOW_MENU_WHEN_UNAUTHENTICATED")
 APP_SEARCH_RESULTS_PER_PAGE = env("APP_SEARCH_RESULTS_PER_PAGE")
+APP_MAGIC_LINK_RETENTION_DAYS = env("APP_MAGIC_LINK_RETENTION_DAYS")
+APP_MAGIC_LINK_USAGE_FLUSH_SECONDS = env("APP_MAGIC_LINK_USAGE_FLUSH_SECONDS")
+APP_SEARCH_QUERY_LOG_FLUSH_SECONDS = env("APP_SEARCH_QUERY_LOG_FLUSH_SECONDS")
@@ -4,6 +4,12 @@ import os
 # Explicitly disable debug mode in production
 DEBUG = False
 
+# Cache
+# Shared between workers, so magic link revocations and access changes reach all of them. The
+# table is created by `manage.py createcachetable` in docker/start.sh. CACHE_URL may point at a
+# faster shared cache instead, e.g. rediscache:// with the redis package installed.
+CACHES = {"default": env.cache("CACHE_URL", default="dbcache://brownsea_cache?max_entries=10000")}  # noqa: F405
+
 # Production Security configuration
 
 # https://docs.djangoproject.com/en/stable/ref/settings/#csrf-cookie-secure
@@ -0,0 +1,53 @@
+from django.db.models.signals import post_delete, post_save
+from wagtail.contrib.redirects.models import Redirect
+from wagtail.models import PageViewRestriction, Site, get_page_models
+from wagtail.signals import page_published, post_page_move
+
+from brownsea.core.access import invalidate_access_gate, invalidate_access_index, update_subtree_access
+from brownsea.core.magic_links import bump_all_magic_link_generations, bump_magic_link_generation
+from brownsea.core.models import BasePage, PageMagicLink
+
+
+def update_access_on_page_move(sender, instance, **kwargs):
+    update_subtree_access(instance, inclusive=True)
+    invalidate_access_index()
+    # Session grants hold the page path they cover, so make them re-check it.
+    bump_magic_link_generation(instance.get_site())
+
+
+def invalidate_access_gate_on_change(sender, instance, **kwargs):
+    # Publishing can change a page's slug, and so the URLs of everything beneath it. Sites,
+    # password restrictions and redirects are part of the gate too.
+    invalidate_access_gate()
+
+
+def invalidate_access_index_on_page_delete(sender, instance, **kwargs):
+    # Paths of deleted pages can be reused by new pages.
+    invalidate_access_index()
+
+
+def bump_generation_on_magic_link_revoke(sender, instance, **kwargs):
+    if instance.revoked_at is not None:
+        bump_magic_link_generation(instance.page.get_site())
+
+
+def bump_generation_on_magic_link_delete(sender, instance, **kwargs):
+    # Grants for expired links lapse by themselves and revoking already bumped the generation.
+    if not instance.is_active:
+        return
+    # The link's page may be being deleted too, so don't rely on finding its site.
+    bump_all_magic_link_generations()
+
+
+def register_signal_handlers():
+    post_page_move.connect(update_access_on_page_move)
+    page_published.connect(invalidate_access_gate_on_change)
+    for model in (Site, PageViewRestriction, Redirect):
+        post_save.connect(invalidate_access_gate_on_change, sender=model)
+        post_delete.connect(invalidate_access_gate_on_change, sender=model)
+    # Connected per model, as a receiver for every sender stops Django fast-deleting anything.
+    for model in get_page_models():
+        if issubclass(model, BasePage):
+            post_delete.connect(invalidate_access_index_on_page_delete, sender=model)
+    post_save.connect(bump_generation_on_magic_link_revoke, sender=PageMagicLink)
+    post_delete.connect(bump_generation_on_magic_link_delete, sender=PageMagicLink)
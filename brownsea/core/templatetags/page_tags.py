@@ -1,6 +1,7 @@
 from django import template
 from django.urls import reverse
 
+from brownsea.core.access import get_access_resolver
 from brownsea.core.magic_links import build_magic_link_url
 from brownsea.core.models import PageAccessLevel
 
@@ -15,10 +16,11 @@ def _page_can_share_magic_links(request, page):
     if not hasattr(specific_page, "get_effective_access_level"):
         return False
 
-    if specific_page.get_effective_access_level() != PageAccessLevel.MAGIC_LINK:
+    resolver = get_access_resolver(request)
+    if resolver.get_effective_access_level(specific_page) != PageAccessLevel.MAGIC_LINK:
         return False
 
-    return specific_page.permissions_for_user(request.user).can_edit()
+    return resolver.can_edit(specific_page)
 
 
 @register.inclusion_tag("components/magic_links/share_button.html", takes_context=True)
@@ -0,0 +1,98 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from wagtail.contrib.redirects.models import Redirect
+
+from brownsea.core.models import PageAccessLevel
+from brownsea.factories import InfoPageFactory, publish
+
+
+@pytest.fixture
+def public_section(site_tree):
+    return publish(
+        InfoPageFactory(
+            parent=site_tree["home"],
+            title="Public section",
+            slug="public-section",
+            access_level=PageAccessLevel.PUBLIC,
+        )
+    )
+
+
+@pytest.fixture
+def members_page(public_section):
+    return publish(
+        InfoPageFactory(
+            parent=public_section,
+            title="Members page",
+            slug="members-page",
+            access_level=PageAccessLevel.LOGGED_IN,
+        )
+    )
+
+
+@pytest.mark.django_db
+def test_gate_redirects_without_loading_pages(client, members_page):
+    client.get(members_page.url)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(members_page.url)
+
+    assert response.status_code == 302
+    assert response.url.startswith(reverse("accounts:login"))
+    assert not [query for query in queries if "wagtailcore_page" in query["sql"]]
+
+
+@pytest.mark.django_db
+def test_gate_lets_public_pages_through(client, public_section, members_page):
+    response = client.get(public_section.url)
+
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_gate_is_refreshed_when_access_changes(client, members_page):
+    assert client.get(members_page.url).status_code == 302
+
+    members_page.access_level = PageAccessLevel.PUBLIC
+    members_page.save_revision().publish()
+
+    assert client.get(members_page.url).status_code == 200
+
+
+@pytest.mark.django_db
+def test_gate_is_refreshed_when_a_page_is_renamed(client, members_page):
+    assert client.get(members_page.url).status_code == 302
+
+    public_section = members_page.get_parent().specific
+    public_section.slug = "renamed-section"
+    public_section.save_revision().publish()
+    public_section.refresh_from_db()
+    members_page.refresh_from_db()
+
+    assert members_page.url.startswith("/renamed-section/")
+    assert client.get(members_page.url).status_code == 302
+    assert client.get(public_section.url).status_code == 200
+
+
+@pytest.mark.django_db
+def test_gate_ignores_logged_in_users(authenticated_client, members_page):
+    response = authenticated_client.get(members_page.url)
+
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_gate_leaves_redirected_paths_to_their_redirects(client, public_section, members_page):
+    assert client.get("/old-public/").status_code == 302
+
+    Redirect.add_redirect("/old-public/", public_section)
+    Redirect.add_redirect("/old-members/?page=2", members_page)
+
+    response = client.get("/old-public/")
+    assert response.status_code == 301
+    assert response.url == public_section.url
+    assert client.get("/old-members/", {"page": "2"}).status_code == 301
+    # Anything else outside the explicit sections is still gated.
+    assert client.get("/not-a-redirect/").status_code == 302
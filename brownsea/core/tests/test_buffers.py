@@ -0,0 +1,91 @@
+import threading
+
+import pytest
+from django.db import DatabaseError
+
+from brownsea.core.buffers import BufferedCounter, reset_all_after_fork
+
+
+class RecordingCounter(BufferedCounter):
+    flush_seconds_setting = "APP_MAGIC_LINK_USAGE_FLUSH_SECONDS"
+
+    def __init__(self, *, fail=False):
+        super().__init__()
+        self.fail = fail
+        self.written = []
+        self.attempted = threading.Event()
+
+    def write(self, counts):
+        try:
+            if self.fail:
+                raise DatabaseError("database is locked")
+            self.written.append(dict(counts))
+            return len(counts)
+        finally:
+            self.attempted.set()
+
+
+@pytest.fixture
+def counter():
+    counter = RecordingCounter()
+    yield counter
+    counter.clear()
+
+
+def test_adding_never_writes_in_the_calling_thread(counter, settings):
+    settings.APP_MAGIC_LINK_USAGE_FLUSH_SECONDS = 60
+
+    counter.add("a")
+    counter.add("a")
+
+    assert counter.written == []
+    assert counter.flush() == 1
+    assert counter.written == [{"a": 2}]
+
+
+def test_counts_are_written_by_a_background_timer(counter, settings):
+    settings.APP_MAGIC_LINK_USAGE_FLUSH_SECONDS = 0.01
+
+    counter.add("a")
+
+    assert counter.attempted.wait(timeout=5)
+    assert counter.written == [{"a": 1}]
+
+
+def test_failed_writes_are_logged_and_kept_for_the_next_flush(settings, caplog):
+    settings.APP_MAGIC_LINK_USAGE_FLUSH_SECONDS = 60
+    counter = RecordingCounter(fail=True)
+    counter.add("a")
+
+    counter.flush_quietly()
+
+    assert "Failed to write buffered counts" in caplog.text
+    counter.fail = False
+    assert counter.flush() == 1
+    assert counter.written == [{"a": 1}]
+    counter.clear()
+
+
+def test_clearing_cancels_the_timer(counter, settings):
+    settings.APP_MAGIC_LINK_USAGE_FLUSH_SECONDS = 0.05
+    counter.add("a")
+
+    counter.clear()
+
+    assert not counter.attempted.wait(timeout=0.2)
+    assert counter.written == []
+
+
+def test_forked_children_start_with_an_empty_unlocked_buffer(counter, settings):
+    settings.APP_MAGIC_LINK_USAGE_FLUSH_SECONDS = 60
+    counter.add("a")
+    parent_timer = counter._timer
+    # As if the parent's timer thread was writing when the process forked.
+    counter._lock.acquire()
+
+    reset_all_after_fork()
+    counter.add("b")
+
+    assert counter.flush() == 1
+    assert counter.written == [{"b": 1}]
+    parent_timer.cancel()
@@ -0,0 +1,68 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from wagtail.images.models import Rendition
+from wagtail_factories import ImageFactory
+
+from brownsea.core.images import prefetch_renditions
+from brownsea.factories import ArticlePageFactory, NewsIndexPageFactory, publish
+from brownsea.news.models import ArticlePage
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.fixture
+def news(site_tree):
+    news = publish(NewsIndexPageFactory(parent=site_tree["home"]))
+    for i in range(3):
+        publish(ArticlePageFactory(parent=news, slug=f"article-{i}", image=ImageFactory(), show_in_menus=True))
+    return news
+
+
+def get_rendition_queries(context):
+    return [query["sql"] for query in context.captured_queries if '"wagtailimages_rendition"' in query["sql"]]
+
+
+@pytest.mark.django_db
+def test_missing_renditions_are_created_together(news):
+    articles = list(ArticlePage.objects.select_related("image"))
+
+    with CaptureQueriesContext(connection) as context:
+        prefetch_renditions(articles, "width-800", "width-200")
+
+    inserts = [sql for sql in get_rendition_queries(context) if sql.startswith("INSERT")]
+    assert len(inserts) == 1
+    assert Rendition.objects.count() == 2 * len(articles)
+    # The new renditions are used without looking them up again.
+    with CaptureQueriesContext(connection) as context:
+        for article in articles:
+            article.image.get_renditions("width-800", "width-200")
+    assert not get_rendition_queries(context)
+
+
+@pytest.mark.django_db
+def test_news_index_loads_every_card_rendition_in_one_query(authenticated_client, news):
+    authenticated_client.get(news.url)
+
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_client.get(news.url)
+
+    assert response.content.decode().count("<img") >= 2 * 3
+    assert len(get_rendition_queries(context)) == 1
+
+
+@pytest.mark.django_db
+def test_recent_news_prefetches_the_lead_article_rendition(authenticated_client, site_tree, news):
+    authenticated_client.get(site_tree["home"].url)
+    assert Rendition.objects.filter(filter_spec="fill-400x200").count() == 1
+    # Render the card again rather than serving it from the cache.
+    cache.clear()
+
+    with CaptureQueriesContext(connection) as context:
+        authenticated_client.get(site_tree["home"].url)
+
+    assert len(get_rendition_queries(context)) == 1
@@ -0,0 +1,212 @@
+import csv
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from brownsea.core.magic_links import create_magic_links
+from brownsea.core.models import PageAccessLevel, PageMagicLink
+from brownsea.factories import InfoPageFactory, UserFactory, publish
+
+
+@pytest.fixture
+def superuser_client(client):
+    client.force_login(UserFactory(is_staff=True, is_superuser=True))
+    return client
+
+
+@pytest.fixture
+def shared_section(site_tree):
+    return publish(
+        InfoPageFactory(
+            parent=site_tree["home"],
+            title="Events",
+            slug="events",
+            access_level=PageAccessLevel.MAGIC_LINK,
+        )
+    )
+
+
+def add_shared_pages(section, count):
+    start = section.get_children().count()
+    return [publish(InfoPageFactory(parent=section, slug=f"{section.slug}-{i}")) for i in range(start, start + count)]
+
+
+def count_queries(func):
+    with CaptureQueriesContext(connection) as context:
+        func()
+    return len(context.captured_queries)
+
+
+def read_csv(response):
+    return list(csv.DictReader(StringIO(response.content.decode())))
+
+
+@pytest.mark.django_db
+def test_bulk_create_makes_numbered_links_for_every_page(superuser_client, shared_section):
+    pages = add_shared_pages(shared_section, 2)
+
+    response = superuser_client.post(
+        reverse("core:magic_links_bulk_create"),
+        {"page": [page.pk for page in pages], "count": 3, "label": "Cubs"},
+    )
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "text/csv"
+    rows = read_csv(response)
+    assert len(rows) == 6
+    assert {row["Label"] for row in rows} == {"Cubs #1", "Cubs #2", "Cubs #3"}
+    assert all("access=" in row["Share URL"] for row in rows)
+    assert PageMagicLink.objects.filter(page__in=pages).count() == 6
+
+
+@pytest.mark.django_db
+def test_bulk_create_runs_a_constant_number_of_queries(superuser_client, shared_section):
+    def create(pages, count):
+        return lambda: superuser_client.post(
+            reverse("core:magic_links_bulk_create"),
+            {"page": [page.pk for page in pages], "count": count},
+        )
+
+    create(add_shared_pages(shared_section, 1), 1)()  # Warm the site and URL caches.
+
+    assert count_queries(create(add_shared_pages(shared_section, 1), 1)) == count_queries(
+        create(add_shared_pages(shared_section, 5), 10)
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_create_rejects_pages_without_magic_link_access(superuser_client, site_tree, shared_section):
+    logged_in_page = publish(InfoPageFactory(parent=site_tree["home"], slug="members"))
+
+    response = superuser_client.post(
+        reverse("core:magic_links_bulk_create"),
+        {"page": [shared_section.pk, logged_in_page.pk], "count": 1},
+    )
+
+    assert response.status_code == 403
+    assert not PageMagicLink.objects.exists()
+
+
+@pytest.mark.django_db
+def test_bulk_revoke_revokes_a_subtree_in_one_update(superuser_client, site_tree, shared_section, user):
+    other_section = publish(
+        InfoPageFactory(parent=site_tree["home"], slug="other", access_level=PageAccessLevel.MAGIC_LINK)
+    )
+    create_magic_links([shared_section, *add_shared_pages(shared_section, 3)], count=2, created_by=user)
+    untouched = create_magic_links([other_section], created_by=user)
+
+    with CaptureQueriesContext(connection) as context:
+        response = superuser_client.post(reverse("core:magic_links_bulk_revoke"), {"page": shared_section.pk})
+
+    assert response.json() == {"revoked": 8}
+    assert len([query for query in context.captured_queries if query["sql"].startswith("UPDATE")]) == 1
+    assert not PageMagicLink.objects.filter(page__path__startswith=shared_section.path).active().exists()
+    assert PageMagicLink.objects.filter(pk=untouched[0].pk).active().exists()
+
+
+@pytest.mark.django_db
+def test_bulk_revoke_by_creator(client, shared_section, user):
+    other_user = UserFactory()
+    create_magic_links([shared_section], count=2, created_by=user)
+    create_magic_links([shared_section], count=2, created_by=other_user)
+    client.force_login(user)
+
+    assert client.post(reverse("core:magic_links_bulk_revoke"), {"created_by": other_user.pk}).status_code == 403
+
+    response = client.post(reverse("core:magic_links_bulk_revoke"), {"created_by": user.pk})
+
+    assert response.json() == {"revoked": 2}
+    assert PageMagicLink.objects.active().filter(created_by=other_user).count() == 2
+
+
+@pytest.mark.django_db
+def test_revoked_links_stop_working_for_existing_sessions(superuser_client, shared_section, user):
+    create_magic_links([shared_section], created_by=user)
+    visitor = Client()
+    share_url = read_csv(superuser_client.get(reverse("core:magic_links_export"), {"page": shared_section.pk}))[0][
+        "Share URL"
+    ]
+    assert visitor.get(share_url, follow=True).status_code == 200
+
+    superuser_client.post(reverse("core:magic_links_bulk_revoke"), {"page": shared_section.pk})
+
+    assert visitor.get(shared_section.url).status_code == 302
+
+
+@pytest.mark.django_db
+def test_export_runs_a_constant_number_of_queries(superuser_client, shared_section, user):
+    def export():
+        return superuser_client.get(reverse("core:magic_links_export"), {"page": shared_section.pk})
+
+    create_magic_links(add_shared_pages(shared_section, 1), created_by=user)
+    export()  # Warm the site and URL caches.
+    queries = count_queries(export)
+    create_magic_links(add_shared_pages(shared_section, 5), count=4, created_by=user)
+
+    assert count_queries(export) == queries
+    assert len(read_csv(export())) == 21
+
+
+@pytest.mark.django_db
+def test_revoke_bulk_action_in_the_admin(superuser_client, shared_section, user):
+    pages = add_shared_pages(shared_section, 2)
+    create_magic_links([shared_section, *pages], created_by=user)
+    url = reverse("wagtail_bulk_action", args=["wagtailcore", "page", "revoke_magic_links"])
+
+    response = superuser_client.post(f"{url}?id={shared_section.pk}&next=/admin/", {"include_descendants": "on"})
+
+    assert response.status_code == 302
+    assert not PageMagicLink.objects.active().exists()
+
+
+@pytest.mark.django_db
+def test_create_bulk_action_in_the_admin(superuser_client, shared_section):
+    pages = add_shared_pages(shared_section, 2)
+    url = reverse("wagtail_bulk_action", args=["wagtailcore", "page", "create_magic_links"])
+    query_string = "&".join(f"id={page.pk}" for page in pages)
+
+    response = superuser_client.post(f"{url}?{query_string}&next=/admin/", {"count": 2, "label": "Scouts"})
+
+    assert response.status_code == 302
+    assert PageMagicLink.objects.filter(page__in=pages, label="Scouts #2").count() == 2
+
+
+@pytest.mark.django_db
+def test_sweep_deletes_links_retired_before_the_retention_window(shared_section, user):
+    now = timezone.now()
+    old_revoked, recently_revoked, old_expired, recently_expired, active, open_ended = create_magic_links(
+        [shared_section], count=6, created_by=user
+    )
+    PageMagicLink.objects.filter(pk=old_revoked.pk).update(revoked_at=now - timedelta(days=100))
+    PageMagicLink.objects.filter(pk=recently_revoked.pk).update(revoked_at=now - timedelta(days=10))
+    PageMagicLink.objects.filter(pk=old_expired.pk).update(expires_at=now - timedelta(days=100))
+    PageMagicLink.objects.filter(pk=recently_expired.pk).update(expires_at=now - timedelta(days=10))
+    PageMagicLink.objects.filter(pk=active.pk).update(expires_at=now + timedelta(days=10))
+
+    call_command("sweep_magic_links", "--retention-days=90", "--batch-size=1", stdout=StringIO())
+
+    assert set(PageMagicLink.objects.values_list("pk", flat=True)) == {
+        recently_revoked.pk,
+        recently_expired.pk,
+        active.pk,
+        open_ended.pk,
+    }
+
+
+@pytest.mark.django_db
+def test_sweep_dry_run_deletes_nothing(shared_section, user):
+    [magic_link] = create_magic_links([shared_section], created_by=user)
+    PageMagicLink.objects.update(revoked_at=timezone.now() - timedelta(days=365))
+    stdout = StringIO()
+
+    call_command("sweep_magic_links", "--dry-run", stdout=stdout)
+
+    assert "Would delete 1 magic link(s)" in stdout.getvalue()
+    assert PageMagicLink.objects.filter(pk=magic_link.pk).exists()
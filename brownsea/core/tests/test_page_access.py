@@ -0,0 +1,316 @@
+import time
+from io import StringIO
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.test import RequestFactory
+from wagtail.models import Page, Site
+
+from brownsea.core.access import (
+    ACCESS_INDEX_CACHE_TIMEOUT,
+    get_access_index,
+    get_access_resolver,
+    get_visibility_filter,
+)
+from brownsea.core.magic_links import (
+    MAGIC_LINK_SESSION_KEY,
+    MagicLinkGrant,
+    bump_magic_link_generation,
+    get_active_session_grants,
+    get_magic_link_generation,
+    grant_magic_link_access,
+    has_magic_link_access,
+)
+from brownsea.core.models import PageAccessLevel, PageMagicLink
+from brownsea.factories import InfoPageFactory, publish
+from brownsea.standard_pages.models import InfoPage
+
+
+@pytest.fixture
+def section(site_tree):
+    return publish(
+        InfoPageFactory(
+            parent=site_tree["home"],
+            title="Section",
+            slug="section",
+            access_level=PageAccessLevel.PUBLIC,
+        )
+    )
+
+
+@pytest.fixture
+def grandchild(section):
+    child = publish(InfoPageFactory(parent=section, title="Child", slug="child"))
+    return publish(InfoPageFactory(parent=child, title="Grandchild", slug="grandchild"))
+
+
+@pytest.fixture
+def magic_link_page(site_tree):
+    return publish(
+        InfoPageFactory(
+            parent=site_tree["home"],
+            title="Shared",
+            slug="shared",
+            access_level=PageAccessLevel.MAGIC_LINK,
+        )
+    )
+
+
+@pytest.mark.django_db
+def test_new_pages_store_the_inherited_access_level(section, grandchild):
+    assert grandchild.effective_access_level == PageAccessLevel.PUBLIC
+    assert grandchild.access_source_path == section.path
+
+
+@pytest.mark.django_db
+def test_site_home_defaults_to_logged_in(site_tree):
+    home = site_tree["home"]
+
+    assert home.effective_access_level == PageAccessLevel.LOGGED_IN
+    assert home.access_source_path == ""
+
+
+@pytest.mark.django_db
+def test_publishing_an_access_change_updates_descendants(section, grandchild):
+    section.access_level = PageAccessLevel.MAGIC_LINK
+    section.save_revision().publish()
+
+    grandchild.refresh_from_db()
+    assert grandchild.effective_access_level == PageAccessLevel.MAGIC_LINK
+    assert grandchild.access_source_path == section.path
+
+
+@pytest.mark.django_db
+def test_draft_access_changes_are_not_applied(section, grandchild):
+    section.access_level = PageAccessLevel.LOGGED_IN
+    section.save_revision()
+
+    grandchild.refresh_from_db()
+    assert grandchild.effective_access_level == PageAccessLevel.PUBLIC
+
+
+@pytest.mark.django_db
+def test_moving_a_page_updates_its_subtree(site_tree, section, grandchild):
+    members = publish(
+        InfoPageFactory(
+            parent=site_tree["home"],
+            title="Members",
+            slug="members",
+            access_level=PageAccessLevel.LOGGED_IN,
+        )
+    )
+    child = grandchild.get_parent()
+
+    child.move(members, pos="last-child")
+
+    grandchild.refresh_from_db()
+    assert grandchild.effective_access_level == PageAccessLevel.LOGGED_IN
+    assert grandchild.access_source_path == members.path
+
+
+@pytest.mark.django_db
+def test_copied_pages_use_their_new_position(site_tree, section, grandchild):
+    members = publish(
+        InfoPageFactory(
+            parent=site_tree["home"],
+            title="Members",
+            slug="members",
+            access_level=PageAccessLevel.LOGGED_IN,
+        )
+    )
+
+    copy = grandchild.get_parent().copy(to=members, recursive=True, update_attrs={"slug": "child-copy"})
+
+    copied_grandchild = InfoPage.objects.child_of(copy).get()
+    assert copied_grandchild.effective_access_level == PageAccessLevel.LOGGED_IN
+    assert copied_grandchild.access_source_path == members.path
+
+
+@pytest.mark.django_db
+def test_backfill_command_repairs_stale_access(section, grandchild):
+    InfoPage.objects.update(effective_access_level=PageAccessLevel.LOGGED_IN, access_source_path="")
+
+    call_command("backfill_page_access", stdout=StringIO())
+
+    grandchild.refresh_from_db()
+    assert grandchild.effective_access_level == PageAccessLevel.PUBLIC
+    assert grandchild.access_source_path == section.path
+
+
+@pytest.mark.django_db
+def test_anonymous_access_check_needs_no_queries(grandchild, django_assert_num_queries):
+    request = RequestFactory().get(grandchild.url)
+    request.user = AnonymousUser()
+
+    with django_assert_num_queries(0):
+        assert grandchild.allow_anonymous_access(request)
+
+
+@pytest.mark.django_db
+def test_access_resolver_memoizes_magic_link_checks(client, magic_link_page, user, django_assert_num_queries):
+    page = magic_link_page
+    magic_link = PageMagicLink.objects.create(page=page, created_by=user)
+    request = RequestFactory().get(page.url)
+    request.user = AnonymousUser()
+    request.session = client.session
+    grant_magic_link_access(request, magic_link)
+    resolver = get_access_resolver(request)
+
+    assert has_magic_link_access(request, page)
+    with django_assert_num_queries(0):
+        assert page.allow_anonymous_access(request)
+        assert has_magic_link_access(request, page)
+
+    assert resolver.misses == 3
+    assert resolver.hits == 3
+
+
+@pytest.fixture
+def session_request(client, site_tree):
+    request = RequestFactory().get("/")
+    request.user = AnonymousUser()
+    request.session = client.session
+    return request
+
+
+@pytest.fixture
+def granted_links(site_tree, session_request, user):
+    magic_links = []
+    for i in range(3):
+        page = publish(
+            InfoPageFactory(
+                parent=site_tree["home"],
+                slug=f"shared-{i}",
+                access_level=PageAccessLevel.MAGIC_LINK,
+            )
+        )
+        magic_link = PageMagicLink.objects.create(page=page, created_by=user)
+        grant_magic_link_access(session_request, magic_link)
+        magic_links.append(magic_link)
+    session_request.session.save()
+    session_request.session.modified = False
+    return magic_links
+
+
+@pytest.mark.django_db
+def test_current_session_grants_are_checked_in_memory(session_request, granted_links, django_assert_num_queries):
+    with django_assert_num_queries(0):
+        grants = get_active_session_grants(session_request)
+
+    assert [grant.path for grant in grants] == [magic_link.page.path for magic_link in granted_links]
+    assert not session_request.session.modified
+
+
+@pytest.mark.django_db
+def test_stale_session_grants_are_rechecked_in_one_query(
+    site_tree, session_request, granted_links, django_assert_num_queries
+):
+    site = Site.find_for_request(session_request)
+    bump_magic_link_generation(site)
+
+    with django_assert_num_queries(1):
+        grants = get_active_session_grants(session_request)
+
+    assert len(grants) == 3
+    assert {grant.generation for grant in grants} == {get_magic_link_generation(site)}
+    with django_assert_num_queries(0):
+        get_active_session_grants(session_request)
+
+
+@pytest.mark.django_db
+def test_revoked_session_grants_are_pruned(session_request, granted_links):
+    revoked, *active = granted_links
+    revoked.revoke()
+
+    grants = get_active_session_grants(session_request)
+
+    assert [grant.token_id for grant in grants] == [str(magic_link.token_id) for magic_link in active]
+    assert len(session_request.session[MAGIC_LINK_SESSION_KEY]) == 2
+
+
+@pytest.mark.django_db
+def test_tampered_session_grants_are_ignored(session_request, granted_links):
+    session_request.session[MAGIC_LINK_SESSION_KEY] = [
+        MagicLinkGrant("token", "0001", None, 0).sign() + "tampered",
+    ]
+
+    assert get_active_session_grants(session_request) == []
+
+
+def test_expired_grants_are_detected_without_the_database():
+    grant = MagicLinkGrant("token", "0001", int(time.time()) - 1, 0)
+
+    assert grant.is_expired
+
+
+@pytest.fixture
+def access_tree(site_tree, section, user):
+    def add(parent, slug, access_level=PageAccessLevel.INHERIT):
+        return publish(InfoPageFactory(parent=parent, title=slug, slug=slug, access_level=access_level))
+
+    home = site_tree["home"]
+    members = add(section, "members", PageAccessLevel.LOGGED_IN)
+    shared = add(home, "shared-section", PageAccessLevel.MAGIC_LINK)
+    pages = {
+        "section": section,
+        "public-child": add(section, "public-child"),
+        "members": members,
+        "members-child": add(members, "members-child"),
+        "public-again": add(members, "public-again", PageAccessLevel.PUBLIC),
+        "shared-section": shared,
+        "shared-granted": add(shared, "shared-granted"),
+        "shared-other": add(shared, "shared-other"),
+        "logged-in": add(home, "logged-in"),
+    }
+    pages["magic_link"] = PageMagicLink.objects.create(page=pages["shared-granted"], created_by=user)
+    return pages
+
+
+@pytest.mark.django_db
+def test_visible_to_filters_anonymous_visitors_by_path(session_request, access_tree, django_assert_num_queries):
+    grant_magic_link_access(session_request, access_tree.pop("magic_link"))
+
+    get_access_index()
+    with django_assert_num_queries(1):
+        visible = set(InfoPage.objects.visible_to(session_request).values_list("slug", flat=True))
+
+    assert visible == {"section", "public-child", "public-again", "shared-granted"}
+    for page in access_tree.values():
+        assert (page.slug in visible) == page.allow_anonymous_access(session_request)
+
+
+@pytest.mark.django_db
+def test_visible_to_does_not_filter_logged_in_users(session_request, access_tree, user):
+    session_request.user = user
+
+    assert InfoPage.objects.visible_to(session_request).count() == InfoPage.objects.count()
+
+
+@pytest.mark.django_db
+def test_visibility_filter_can_be_used_in_search(session_request, access_tree):
+    results = Page.objects.live().filter(get_visibility_filter(session_request)).search("public")
+
+    assert {page.slug for page in results} == {"public-child", "public-again"}
+
+
+@pytest.mark.django_db
+def test_deleting_a_page_invalidates_the_access_index(section):
+    assert (section.path, PageAccessLevel.PUBLIC) in get_access_index()
+
+    section.delete()
+
+    assert (section.path, PageAccessLevel.PUBLIC) not in get_access_index()
+
+
+@pytest.mark.django_db
+def test_access_index_expires_when_an_invalidation_is_missed(section, monkeypatch):
+    assert (section.path, PageAccessLevel.PUBLIC) in get_access_index()
+    # As if another worker made the change without reaching this worker's cache.
+    InfoPage.objects.filter(pk=section.pk).update(access_level=PageAccessLevel.LOGGED_IN)
+    assert (section.path, PageAccessLevel.PUBLIC) in get_access_index()
+
+    later = time.time() + ACCESS_INDEX_CACHE_TIMEOUT + 1
+    monkeypatch.setattr(time, "time", lambda: later)
+
+    assert (section.path, PageAccessLevel.LOGGED_IN) in get_access_index()
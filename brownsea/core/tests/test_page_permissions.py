@@ -1,11 +1,18 @@
 from datetime import timedelta
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from wagtail.models import PageViewRestriction
 
-from brownsea.core.magic_links import build_magic_link_url, sign_magic_link
+from brownsea.core.magic_links import (
+    build_magic_link_url,
+    get_magic_links_for_display,
+    magic_link_usage,
+    sign_magic_link,
+)
 from brownsea.core.models import PageAccessLevel, PageMagicLink
 from brownsea.factories import GroupFactory, InfoPageFactory, UserFactory, publish
 
@@ -339,3 +346,70 @@ def test_create_magic_link_from_admin_redirects_to_edit(client, magic_link_page)
     assert response.status_code == 302
     assert response.url == reverse("wagtailadmin_pages:edit", args=[magic_link_page.id])
     assert PageMagicLink.objects.filter(page=magic_link_page, label="Admin link").exists()
+
+
+@pytest.mark.django_db
+def test_admin_panel_loads_links_in_one_query(client, magic_link_page, active_magic_link, user):
+    PageMagicLink.objects.create(page=magic_link_page, label="Old invite", revoked_at=timezone.now(), created_by=user)
+    client.force_login(UserFactory(is_staff=True, is_superuser=True))
+    url = reverse("core:magic_links_admin_panel", args=[magic_link_page.id])
+    client.get(url)  # Warm the site and URL caches.
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+
+    assert response.status_code == 200
+    assert response.context["active_links"][0]["share_url"] == build_magic_link_url(active_magic_link)
+    assert [link.label for link in response.context["inactive_links"]] == ["Old invite"]
+    assert len([query for query in context.captured_queries if "core_pagemagiclink" in query["sql"]]) == 1
+
+
+@pytest.mark.django_db
+def test_panel_resolves_the_page_url_once(rf, magic_link_page, user, monkeypatch):
+    for label in ("One", "Two", "Three"):
+        PageMagicLink.objects.create(page=magic_link_page, label=label, created_by=user)
+    calls = []
+    get_full_url = magic_link_page.get_full_url
+    monkeypatch.setattr(magic_link_page, "get_full_url", lambda request=None: calls.append(1) or get_full_url(request))
+
+    active_links, _ = get_magic_links_for_display(magic_link_page, rf.get("/"))
+
+    assert len(active_links) == 3
+    assert len(calls) == 1
+
+
+@pytest.mark.django_db
+def test_magic_link_usage_is_buffered_until_flushed(client, magic_link_page, active_magic_link):
+    with CaptureQueriesContext(connection) as context:
+        client.get(f"{magic_link_page.url}?access={sign_magic_link(active_magic_link)}", follow=True)
+        client.get(magic_link_page.url)
+
+    assert not [query for query in context.captured_queries if "UPDATE" in query["sql"] and "magiclink" in query["sql"]]
+    active_magic_link.refresh_from_db()
+    assert active_magic_link.redemption_count == 0
+
+    with CaptureQueriesContext(connection) as context:
+        assert magic_link_usage.flush() == 1
+
+    assert len(context.captured_queries) == 1
+    active_magic_link.refresh_from_db()
+    assert active_magic_link.redemption_count == 1
+    assert active_magic_link.view_count == 2
+    assert active_magic_link.last_used_at is not None
+
+
+@pytest.mark.django_db
+def test_magic_link_usage_flushes_every_link_in_one_update(magic_link_page, user, django_assert_num_queries):
+    magic_links = [PageMagicLink.objects.create(page=magic_link_page, created_by=user) for _ in range(3)]
+    for count, magic_link in enumerate(magic_links, start=1):
+        for _ in range(count):
+            magic_link_usage.record_view(str(magic_link.token_id))
+
+    with django_assert_num_queries(1):
+        magic_link_usage.flush()
+
+    assert list(PageMagicLink.objects.order_by("pk").values_list("redemption_count", "view_count")) == [
+        (0, 1),
+        (0, 2),
+        (0, 3),
+    ]
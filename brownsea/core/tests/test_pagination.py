@@ -0,0 +1,174 @@
+import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from brownsea.core.pagination import CountlessPaginator, KeysetPaginator
+from brownsea.factories import ArticlePageFactory, InfoPageFactory, NewsIndexPageFactory, publish
+from brownsea.news.models import ArticlePage
+from brownsea.standard_pages.models import IndexPage, InfoPage
+
+
+def test_pages_through_a_list_without_a_known_total():
+    paginator = CountlessPaginator(list(range(25)), per_page=10)
+
+    first = paginator.get_page(1)
+
+    assert list(first) == list(range(10))
+    assert first.has_next() and not first.has_previous()
+    assert paginator.count is None
+
+    last = paginator.get_page(3)
+
+    assert list(last) == list(range(20, 25))
+    assert not last.has_next()
+    assert (last.start_index(), last.end_index()) == (21, 25)
+    assert (paginator.count, paginator.num_pages) == (25, 3)
+
+
+@pytest.mark.parametrize(("number", "expected"), [("x", 1), (None, 1), (0, 1), (-2, 1), (9, 3)])
+def test_invalid_page_numbers_fall_back_like_get_page(number, expected):
+    assert CountlessPaginator(list(range(25)), per_page=10).get_page(number).number == expected
+
+
+@pytest.fixture
+def pages(site_tree):
+    return [publish(InfoPageFactory(parent=site_tree["home"], title=f"Page {i}", slug=f"page-{i}")) for i in range(5)]
+
+
+@pytest.mark.django_db
+def test_querysets_are_paged_without_counting(pages, django_assert_num_queries):
+    paginator = CountlessPaginator(InfoPage.objects.order_by("pk"), per_page=2)
+
+    with django_assert_num_queries(1):
+        page = paginator.get_page(2)
+
+    assert [info_page.slug for info_page in page] == ["page-2", "page-3"]
+    assert page.has_next()
+
+
+@pytest.mark.django_db
+def test_pages_past_the_end_count_once_to_find_the_last_page(pages, django_assert_num_queries):
+    paginator = CountlessPaginator(InfoPage.objects.order_by("pk"), per_page=2)
+
+    with django_assert_num_queries(3):
+        page = paginator.get_page(10)
+
+    assert page.number == 3
+    assert [info_page.slug for info_page in page] == ["page-4"]
+
+
+@pytest.mark.django_db
+def test_index_pages_list_children_without_counting(authenticated_client, site_tree, settings):
+    settings.APP_SEARCH_RESULTS_PER_PAGE = 2
+    index = publish(site_tree["home"].add_child(instance=IndexPage(title="Guides", slug="guides", introduction="All")))
+    for i in range(3):
+        publish(InfoPageFactory(parent=index, title=f"Guide {i}", slug=f"guide-{i}", show_in_menus=True))
+
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_client.get(index.url)
+
+    sub_pages = response.context["sub_pages"]
+    assert [sub_page.title for sub_page in sub_pages] == ["Guide 0", "Guide 1"]
+    assert sub_pages.has_next()
+    assert not [query for query in context.captured_queries if "COUNT(" in query["sql"].upper()]
+
+
+@pytest.fixture
+def articles(site_tree):
+    news = publish(NewsIndexPageFactory(parent=site_tree["home"], show_in_menus=True))
+    # Two articles share each date, so ties have to be broken by id.
+    return news, [
+        publish(
+            ArticlePageFactory(
+                parent=news,
+                slug=f"article-{i}",
+                publication_date=datetime.date(2025, 1, 1) + datetime.timedelta(days=i // 2),
+            )
+        )
+        for i in range(7)
+    ]
+
+
+@pytest.mark.django_db
+def test_article_sort_date_follows_the_display_date(site_tree):
+    news = publish(NewsIndexPageFactory(parent=site_tree["home"]))
+    article = publish(ArticlePageFactory(parent=news))
+    article.refresh_from_db()
+    assert article.sort_date == article.first_published_at.date()
+
+    article.publication_date = datetime.date(2020, 5, 1)
+    article.save(update_fields=["publication_date"])
+
+    assert ArticlePage.objects.get(pk=article.pk).sort_date == datetime.date(2020, 5, 1)
+
+
+@pytest.mark.django_db
+def test_keyset_pages_walk_forwards_and_back(articles):
+    news, _ = articles
+    paginator = KeysetPaginator(ArticlePage.objects.child_of(news), per_page=3, field="sort_date")
+    newest_first = list(ArticlePage.objects.child_of(news).order_by("-sort_date", "-pk"))
+
+    first = paginator.get_page()
+    second = paginator.get_page(after=first.next_cursor())
+    third = paginator.get_page(after=second.next_cursor())
+
+    assert [*first, *second, *third] == newest_first
+    assert not first.has_previous() and first.has_next()
+    assert not third.has_next()
+    assert list(paginator.get_page(before=third.previous_cursor())) == list(second)
+    assert list(paginator.get_page(before=second.previous_cursor())) == list(first)
+    assert not paginator.get_page(before=second.previous_cursor()).has_previous()
+
+
+@pytest.mark.parametrize("cursor", ["nonsense", "2025-13-01_1", "2025-01-01_x", ""])
+@pytest.mark.django_db
+def test_invalid_cursors_fall_back_to_the_first_page(articles, cursor):
+    news, _ = articles
+    paginator = KeysetPaginator(ArticlePage.objects.child_of(news), per_page=3, field="sort_date")
+
+    assert list(paginator.get_page(after=cursor)) == list(paginator.get_page())
+    assert list(paginator.get_page(before=cursor)) == list(paginator.get_page())
+
+
+@pytest.mark.django_db
+def test_news_index_pages_by_cursor_without_offsets(authenticated_client, articles, settings):
+    settings.APP_SEARCH_RESULTS_PER_PAGE = 3
+    news, _ = articles
+
+    first = authenticated_client.get(news.url).context["sub_pages"]
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_client.get(news.url, {"after": first.next_cursor()})
+
+    sub_pages = response.context["sub_pages"]
+    assert [article.slug for article in sub_pages] == ["article-3", "article-2", "article-1"]
+    assert sub_pages.has_previous() and sub_pages.has_next()
+    assert f"?after={sub_pages.next_cursor()}" in response.content.decode()
+    listing = [query["sql"] for query in context.captured_queries if "sort_date" in query["sql"]]
+    assert listing and not [sql for sql in listing if "OFFSET" in sql.upper()]
+
+
+@pytest.mark.django_db
+def test_news_index_leaves_out_articles_without_a_sort_date(authenticated_client, articles, settings):
+    settings.APP_SEARCH_RESULTS_PER_PAGE = 3
+    news, _ = articles
+    # Enough undated articles that one would end the first page and name its next cursor.
+    ArticlePage.objects.exclude(slug__in=["article-5", "article-6"]).update(sort_date=None)
+
+    response = authenticated_client.get(news.url)
+
+    assert response.status_code == 200
+    assert [article.slug for article in response.context["sub_pages"]] == ["article-6", "article-5"]
+
+
+@pytest.mark.django_db
+def test_article_news_index_path_follows_the_path(site_tree):
+    news = publish(NewsIndexPageFactory(parent=site_tree["home"]))
+    other_news = publish(NewsIndexPageFactory(parent=site_tree["home"]))
+    article = publish(ArticlePageFactory(parent=news))
+
+    article.path = other_news.path + article.path[-article.steplen :]
+    article.save(update_fields=["path"])
+
+    assert ArticlePage.objects.get(pk=article.pk).news_index_path == other_news.path
@@ -13,7 +13,9 @@ urlpatterns = [
     path("admin/", include(wagtailadmin_urls)),
     path("documents/", include(wagtaildocs_urls)),
     path("events/", include("brownsea.events.urls", namespace="events")),
+    path("feeds/news/", include("brownsea.news.urls", namespace="news")),
     path("search/", search_views.search, name="search"),
+    path("search/autocomplete/", search_views.autocomplete, name="search_autocomplete"),
     path("", include("brownsea.core.page_urls", namespace="core")),
 ]
 
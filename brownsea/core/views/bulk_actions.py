@@ -0,0 +1,115 @@
+from django import forms
+from django.db.models import Q
+from django.shortcuts import get_list_or_404
+from django.utils.translation import ngettext
+from wagtail.admin.views.pages.bulk_actions.page_bulk_action import PageBulkAction
+
+from brownsea.core.access import get_access_resolver
+from brownsea.core.forms import MagicLinkBulkCreateForm
+from brownsea.core.magic_links import create_magic_links, revoke_magic_links
+from brownsea.core.models import PageMagicLink
+from brownsea.core.views.magic_links import _magic_links_csv_response, _page_supports_magic_links
+
+
+class MagicLinkSubtreeForm(forms.Form):
+    include_descendants = forms.BooleanField(
+        required=False,
+        initial=True,
+        label="Include links to subpages",
+    )
+
+
+def _get_links_for_pages(pages, *, include_descendants):
+    """Return the links to ``pages``, and to their subpages if asked, as one query."""
+    if not include_descendants:
+        return PageMagicLink.objects.filter(page__in=pages)
+
+    subtrees = Q(pk__in=[])
+    for page in pages:
+        subtrees |= Q(page__path__startswith=page.path)
+    return PageMagicLink.objects.filter(subtrees)
+
+
+class MagicLinkBulkAction(PageBulkAction):
+    template_name = "wagtailadmin/pages/bulk_actions/confirm_bulk_magic_links.html"
+    form_class = MagicLinkSubtreeForm
+    action_button_text = ""
+
+    @classmethod
+    def get_queryset(cls, model, object_ids):
+        # Access levels live on the specific models.
+        return get_list_or_404(model.objects.specific(), pk__in=object_ids)
+
+    def check_perm(self, page):
+        return get_access_resolver(self.request).can_edit(page)
+
+    def get_context_data(self, **kwargs):
+        return {
+            **super().get_context_data(**kwargs),
+            "action_heading": self.display_name,
+            "action_button_text": self.action_button_text,
+        }
+
+    def get_execution_context(self):
+        return self.cleaned_form.cleaned_data
+
+
+class CreateMagicLinksBulkAction(MagicLinkBulkAction):
+    display_name = "Create magic links"
+    action_type = "create_magic_links"
+    aria_label = "Create magic links for the selected pages"
+    action_priority = 90
+    form_class = MagicLinkBulkCreateForm
+    action_button_text = "Create links"
+
+    def check_perm(self, page):
+        return super().check_perm(page) and _page_supports_magic_links(self.request, page)
+
+    def get_execution_context(self):
+        return {**super().get_execution_context(), "created_by": self.request.user}
+
+    @classmethod
+    def execute_action(cls, objects, *, count=1, label="", expires_at=None, created_by=None, **kwargs):
+        create_magic_links(objects, count=count, label=label.strip(), expires_at=expires_at, created_by=created_by)
+        return len(objects), 0
+
+    def get_success_message(self, num_parent_objects, num_child_objects):
+        return ngettext(
+            "Magic links have been created for %(count)d page",
+            "Magic links have been created for %(count)d pages",
+            num_parent_objects,
+        ) % {"count": num_parent_objects}
+
+
+class RevokeMagicLinksBulkAction(MagicLinkBulkAction):
+    display_name = "Revoke magic links"
+    action_type = "revoke_magic_links"
+    aria_label = "Revoke the magic links for the selected pages"
+    action_priority = 91
+    action_button_text = "Revoke links"
+
+    @classmethod
+    def execute_action(cls, objects, *, include_descendants=True, **kwargs):
+        return revoke_magic_links(_get_links_for_pages(objects, include_descendants=include_descendants)), 0
+
+    def get_success_message(self, num_parent_objects, num_child_objects):
+        return ngettext(
+            "%(count)d magic link has been revoked",
+            "%(count)d magic links have been revoked",
+            num_parent_objects,
+        ) % {"count": num_parent_objects}
+
+
+class ExportMagicLinksBulkAction(MagicLinkBulkAction):
+    display_name = "Export magic links"
+    action_type = "export_magic_links"
+    aria_label = "Export the magic links for the selected pages"
+    action_priority = 92
+    action_button_text = "Download CSV"
+
+    def form_valid(self, form):
+        objects, _ = self.get_actionable_objects()
+        include_descendants = form.cleaned_data["include_descendants"]
+        magic_links = _get_links_for_pages(objects, include_descendants=include_descendants).active()
+        magic_links = magic_links.select_related("page")
+        return _magic_links_csv_response(self.request, magic_links, "magic-links.csv")
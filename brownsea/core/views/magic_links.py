@@ -1,6 +1,6 @@
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils import timezone
@@ -8,36 +8,42 @@ from django.utils.dateparse import parse_datetime
 from django.views.decorators.http import require_POST
 from wagtail.models import Page
 
-from brownsea.core.magic_links import build_magic_link_url
+from brownsea.core.access import get_access_resolver
+from brownsea.core.forms import MagicLinkBulkCreateForm, MagicLinkBulkRevokeForm
+from brownsea.core.magic_links import (
+    build_magic_link_url,
+    create_magic_links,
+    get_magic_links_for_display,
+    get_magic_links_under,
+    revoke_magic_links,
+    write_magic_links_csv,
+)
 from brownsea.core.models import PageAccessLevel, PageMagicLink
 
 
-def _page_supports_magic_links(page):
+def _page_supports_magic_links(request, page):
     specific_page = page.specific
     if not hasattr(specific_page, "get_effective_access_level"):
         return False
     return (
         specific_page.access_level == PageAccessLevel.MAGIC_LINK
-        or specific_page.get_effective_access_level() == PageAccessLevel.MAGIC_LINK
+        or get_access_resolver(request).get_effective_access_level(specific_page) == PageAccessLevel.MAGIC_LINK
     )
 
 
 def _get_editable_page(request, page_id, *, require_magic_link_access=False):
     page = get_object_or_404(Page, id=page_id).specific
-    if not page.permissions_for_user(request.user).can_edit():
+    if not get_access_resolver(request).can_edit(page):
         raise PermissionDenied
-    if require_magic_link_access and not _page_supports_magic_links(page):
+    if require_magic_link_access and not _page_supports_magic_links(request, page):
         raise PermissionDenied
     return page
 
 
 def _get_magic_links_context(page, request):
-    magic_links = PageMagicLink.objects.filter(page=page)
-    active_links = list(magic_links.active())
-    inactive_links = [link for link in magic_links if not link.is_active]
+    active_links, inactive_links = get_magic_links_for_display(page, request)
     return {
         "page": page,
-        "magic_links": magic_links,
         "active_links": active_links,
         "inactive_links": inactive_links,
     }
@@ -61,6 +67,16 @@ def magic_links_panel(request, page_id):
     )
 
 
+@login_required
+def magic_links_admin_panel(request, page_id):
+    page = _get_editable_page(request, page_id, require_magic_link_access=True)
+    return render(
+        request,
+        "wagtailadmin/panels/magic_links_panel_links.html",
+        _get_magic_links_context(page, request),
+    )
+
+
 @login_required
 @require_POST
 def magic_links_create(request, page_id):
@@ -112,3 +128,70 @@ def magic_links_revoke(request, page_id, token_id):
         return redirect_response
 
     return magic_links_panel(request, page_id)
+
+
+def _magic_links_csv_response(request, magic_links, filename):
+    response = HttpResponse(content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    write_magic_links_csv(magic_links, response, request)
+    return response
+
+
+@login_required
+@require_POST
+def magic_links_bulk_create(request):
+    form = MagicLinkBulkCreateForm(request.POST)
+    if not form.is_valid():
+        return HttpResponseBadRequest(form.errors.as_text())
+
+    page_ids = set(request.POST.getlist("page"))
+    if not page_ids or not all(page_id.isdigit() for page_id in page_ids):
+        return HttpResponseBadRequest("Choose the pages to create links for.")
+    pages = list(Page.objects.filter(id__in=page_ids).specific())
+    if len(pages) != len(page_ids):
+        raise Http404
+    resolver = get_access_resolver(request)
+    for page in pages:
+        if not resolver.can_edit(page) or not _page_supports_magic_links(request, page):
+            raise PermissionDenied
+
+    magic_links = create_magic_links(
+        pages,
+        count=form.cleaned_data["count"],
+        label=form.cleaned_data["label"].strip(),
+        expires_at=form.cleaned_data["expires_at"],
+        created_by=request.user,
+    )
+    return _magic_links_csv_response(request, magic_links, "magic-links.csv")
+
+
+@login_required
+@require_POST
+def magic_links_bulk_revoke(request):
+    form = MagicLinkBulkRevokeForm(request.POST)
+    if not form.is_valid():
+        return HttpResponseBadRequest(form.errors.as_text())
+
+    magic_links = PageMagicLink.objects.all()
+    if form.cleaned_data["page"] is not None:
+        page = _get_editable_page(request, form.cleaned_data["page"])
+        magic_links = get_magic_links_under(page)
+    elif not request.user.is_superuser:
+        # Links across the whole site can only be revoked by their creator.
+        if form.cleaned_data["created_by"] != request.user.pk:
+            raise PermissionDenied
+
+    if form.cleaned_data["created_by"] is not None:
+        magic_links = magic_links.filter(created_by_id=form.cleaned_data["created_by"])
+
+    return JsonResponse({"revoked": revoke_magic_links(magic_links)})
+
+
+@login_required
+def magic_links_export(request):
+    page_id = request.GET.get("page", "")
+    if not page_id.isdigit():
+        return HttpResponseBadRequest("Choose the page to export links for.")
+    page = _get_editable_page(request, page_id)
+    magic_links = get_magic_links_under(page).active().select_related("page")
+    return _magic_links_csv_response(request, magic_links, f"magic-links-{page.slug}.csv")
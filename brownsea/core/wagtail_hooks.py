@@ -3,6 +3,7 @@ from wagtail.snippets.models import register_snippet
 from wagtail.snippets.views.snippets import SnippetViewSet
 
 from .models import Author, CallToAction
+from .views.bulk_actions import CreateMagicLinksBulkAction, ExportMagicLinksBulkAction, RevokeMagicLinksBulkAction
 
 
 @register_snippet
@@ -26,3 +27,7 @@ class CallToActionSnippetViewSet(SnippetViewSet):
 @hooks.register("register_icons")
 def register_icons(icons):
     return icons + ["icons/bullhorn.svg"]
+
+
+for bulk_action in (CreateMagicLinksBulkAction, RevokeMagicLinksBulkAction, ExportMagicLinksBulkAction):
+    hooks.register("register_bulk_action", bulk_action)
@@ -3,7 +3,7 @@ from wagtail.admin.panels import FieldPanel
 from wagtail.search import index
 
 from brownsea.core.blocks import StoryBlock
-from brownsea.core.models import BasePage, InPageNavMixin
+from brownsea.core.models import INTRODUCTION_SEARCH_BOOST, BasePage, InPageNavMixin
 from brownsea.core.utils import StreamField
 
 from .snippets import ExternalEventCalendar
@@ -30,6 +30,6 @@ class CalendarPage(InPageNavMixin, BasePage):
     ]
 
     search_fields = BasePage.search_fields + [
-        index.SearchField("introduction"),
+        index.SearchField("introduction", boost=INTRODUCTION_SEARCH_BOOST),
         index.SearchField("body"),
     ]
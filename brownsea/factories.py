@@ -4,6 +4,7 @@ from factory.django import DjangoModelFactory
 from wagtail_factories import PageFactory
 
 from brownsea.home.models import HomePage
+from brownsea.news.models import ArticlePage, NewsIndexPage, NewsType
 from brownsea.standard_pages.models import InfoPage
 
 
@@ -48,3 +49,31 @@ class InfoPageFactory(PageFactory):
     title = factory.Sequence(lambda n: f"Info page {n}")
     introduction = "Introduction"
     body = []
+
+
+class NewsTypeFactory(DjangoModelFactory):
+    class Meta:
+        model = NewsType
+        django_get_or_create = ("slug",)
+
+    name = factory.Sequence(lambda n: f"News type {n}")
+    slug = factory.Sequence(lambda n: f"news-type-{n}")
+
+
+class NewsIndexPageFactory(PageFactory):
+    class Meta:
+        model = NewsIndexPage
+
+    title = "News"
+    slug = factory.Sequence(lambda n: f"news-{n}")
+    introduction = "News"
+
+
+class ArticlePageFactory(PageFactory):
+    class Meta:
+        model = ArticlePage
+
+    title = factory.Sequence(lambda n: f"Article {n}")
+    introduction = "Introduction"
+    news_type = factory.SubFactory(NewsTypeFactory)
+    body = []
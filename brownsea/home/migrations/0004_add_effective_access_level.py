@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("home", "0003_enable_multiple_news_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="homepage",
+            name="access_source_path",
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="homepage",
+            name="effective_access_level",
+            field=models.CharField(
+                choices=[
+                    ("inherit", "Inherit"),
+                    ("logged_in", "Logged in only"),
+                    ("magic_link", "Magic link"),
+                    ("public", "Public"),
+                ],
+                db_index=True,
+                default="logged_in",
+                editable=False,
+                max_length=20,
+            ),
+        ),
+    ]
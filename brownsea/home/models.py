@@ -21,3 +21,6 @@ class HomePage(RecentNewsMixin, BasePage):
         FieldPanel("body"),
         FieldPanel("news_index_page"),
     ]
+
+    def get_recent_news_card_context(self) -> dict:
+        return {"article_type_plural": "news", "feature_lead_article": True}
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class NewsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "brownsea.news"
+
+    def ready(self):
+        from brownsea.news.signal_handlers import register_signal_handlers
+
+        register_signal_handlers()
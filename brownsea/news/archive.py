@@ -0,0 +1,118 @@
+import calendar
+import datetime
+from collections import Counter
+from dataclasses import dataclass
+
+from django.db.models import Count
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+ARCHIVE_PARAMETERS = ("year", "month", "news_type")
+
+
+@dataclass(frozen=True)
+class ArchiveMonth:
+    date: datetime.date
+    count: int
+    selected: bool
+
+
+@dataclass(frozen=True)
+class ArchiveYear:
+    year: int
+    count: int
+    selected: bool
+    months: list[ArchiveMonth]
+
+
+@dataclass(frozen=True)
+class ArchiveNewsType:
+    slug: str
+    name: str
+    count: int
+    selected: bool
+
+
+def count_articles(articles) -> list[tuple[int, int, str, str, int]]:
+    """
+    Return (year, month, news type slug, news type name, count) for the ``articles``, from a
+    single grouped query, so both the dates and the news types can be counted from the rows.
+    """
+    return list(
+        articles.filter(sort_date__isnull=False)
+        .annotate(year=ExtractYear("sort_date"), month=ExtractMonth("sort_date"))
+        .values_list("year", "month", "news_type__slug", "news_type__name")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+
+
+def get_selected_archive(request) -> dict:
+    """Return the year, month and news type slug chosen in ``request``, ignoring invalid values."""
+    selected = {"year": None, "month": None, "news_type": request.GET.get("news_type", "")}
+    try:
+        selected["year"] = datetime.date(int(request.GET["year"]), 1, 1).year
+        if request.GET.get("month"):
+            selected["month"] = datetime.date(selected["year"], int(request.GET["month"]), 1).month
+    except (KeyError, ValueError, OverflowError):
+        pass
+    return selected
+
+
+def filter_articles(articles, selected):
+    """Narrow the ``articles`` to the selected year or month and news type."""
+    if selected["year"]:
+        year, month = selected["year"], selected["month"]
+        start = datetime.date(year, month or 1, 1)
+        end = datetime.date(year, month, calendar.monthrange(year, month)[1]) if month else datetime.date(year, 12, 31)
+        # A range rather than __year, so the (index, sort date) index can be used. Inclusive, so
+        # the last year there is doesn't need a date after it.
+        articles = articles.filter(sort_date__range=(start, end))
+    if selected["news_type"]:
+        articles = articles.filter(news_type__slug=selected["news_type"])
+    return articles
+
+
+def get_archive(rows, selected) -> dict[str, list]:
+    """
+    Build the archive navigation from the ``rows`` of ``count_articles``. Dates are counted
+    with the news type selection applied and news types with the date selection applied, so
+    each count says how many articles choosing that option would show.
+    """
+    month_counts = Counter()
+    news_type_counts = Counter()
+    for year, month, slug, name, count in rows:
+        if not selected["news_type"] or slug == selected["news_type"]:
+            month_counts[year, month] += count
+        if selected["year"] in (None, year) and selected["month"] in (None, month):
+            news_type_counts[slug, name] += count
+
+    years = []
+    for year in sorted({year for year, _month in month_counts}, reverse=True):
+        months = [
+            ArchiveMonth(
+                datetime.date(year, month, 1),
+                month_counts[year, month],
+                selected["year"] == year and selected["month"] == month,
+            )
+            for month in range(12, 0, -1)
+            if month_counts[year, month]
+        ]
+        years.append(
+            ArchiveYear(
+                year,
+                sum(month.count for month in months),
+                selected["year"] == year and not selected["month"],
+                months,
+            )
+        )
+
+    return {
+        "years": years,
+        "news_types": sorted(
+            (
+                ArchiveNewsType(slug, name, count, slug == selected["news_type"])
+                for (slug, name), count in news_type_counts.items()
+            ),
+            key=lambda option: option.name,
+        ),
+    }
@@ -0,0 +1,124 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+RECENT_NEWS_CACHE_PREFIX = "brownsea:recent-news"
+NEWS_ARCHIVE_CACHE_PREFIX = "brownsea:news-archive"
+NEWS_FEED_CACHE_PREFIX = "brownsea:news-feed"
+NEWS_CACHE_TIMEOUT = 60 * 60
+# The rendition components/recent_news_card.html shows for a featured lead article's image.
+RECENT_NEWS_LEAD_RENDITIONS = ("fill-400x200",)
+# Bumped when pages move or news indexes come or go, which can change the articles in a news index
+# and the index a landing page shows news from.
+NEWS_INDEXES_VERSION_CACHE_KEY = f"{RECENT_NEWS_CACHE_PREFIX}:indexes-version"
+
+
+def get_news_index_version_cache_key(news_index_page_id: int) -> str:
+    return f"{RECENT_NEWS_CACHE_PREFIX}:index-version:{news_index_page_id}"
+
+
+def get_version(key: str) -> int:
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    # Without a working cache nothing is ever found in it either.
+    return version if version is not None else time.time_ns()
+
+
+def bump_news_indexes_version() -> None:
+    cache.set(NEWS_INDEXES_VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+
+
+def bump_news_index_versions(page) -> None:
+    """Invalidate the recent news of every news index that is, contains or is inside ``page``."""
+    from brownsea.news.models import NewsIndexPage
+
+    news_index_page_ids = (
+        NewsIndexPage.objects.ancestor_of(page, inclusive=True) | NewsIndexPage.objects.descendant_of(page)
+    ).values_list("pk", flat=True)
+    version = time.time_ns()
+    cache.set_many(
+        {get_news_index_version_cache_key(news_index_page_id): version for news_index_page_id in news_index_page_ids},
+        timeout=None,
+    )
+
+
+def get_visibility_digest(request) -> str:
+    from brownsea.core.access import get_visibility_filter
+
+    # Anonymous visitors only see the articles they may view, which depends on their magic links.
+    return hashlib.sha256(str(get_visibility_filter(request)).encode()).hexdigest()
+
+
+def get_recent_news_cache_key(page, request) -> str:
+    # Publishing the landing page may change its news index or how the card is labelled.
+    published = page.last_published_at.timestamp() if page.last_published_at else ""
+    return f"{RECENT_NEWS_CACHE_PREFIX}:{page.pk}:{published}:{get_visibility_digest(request)}"
+
+
+def get_archive_rows(news_index_page, request) -> list[tuple]:
+    """
+    Return the archive counts of ``news_index_page``, as from ``count_articles``, cached per
+    viewer access until an article in it is next published, unpublished, moved or deleted.
+    """
+    from brownsea.news.archive import count_articles
+
+    indexes_version = get_version(NEWS_INDEXES_VERSION_CACHE_KEY)
+    index_version = get_version(get_news_index_version_cache_key(news_index_page.pk))
+    digest = get_visibility_digest(request)
+    key = f"{NEWS_ARCHIVE_CACHE_PREFIX}:{news_index_page.pk}:{indexes_version}:{index_version}:{digest}"
+    rows = cache.get(key)
+    if rows is None:
+        rows = count_articles(news_index_page.get_articles(request))
+        cache.set(key, rows, NEWS_CACHE_TIMEOUT)
+    return rows
+
+
+def render_recent_news_card(page, request, news_index_page) -> str:
+    from brownsea.core.images import prefetch_renditions
+
+    recent_news = list(page.get_recent_news(request, news_index_page=news_index_page)) if news_index_page else []
+    if not recent_news:
+        return ""
+    card_context = page.get_recent_news_card_context()
+    if card_context.get("feature_lead_article"):
+        prefetch_renditions(recent_news[:1], *RECENT_NEWS_LEAD_RENDITIONS)
+    return render_to_string(
+        "components/recent_news_card.html",
+        {"recent_news": recent_news, "news_index_page": news_index_page, **card_context},
+    )
+
+
+def get_recent_news_card(page, request) -> str:
+    """
+    Return the rendered recent news card for the landing ``page``, or an empty string if it has
+    no news to show. Cards are cached per landing page and viewer access until an article in the
+    page's news index is published, unpublished, moved or deleted, so a warm card costs no queries.
+    """
+    if getattr(request, "is_preview", False):
+        return render_recent_news_card(page, request, page.get_news_index_page())
+
+    key = get_recent_news_cache_key(page, request)
+    indexes_version = get_version(NEWS_INDEXES_VERSION_CACHE_KEY)
+    cached = cache.get(key)
+    if cached is not None:
+        cached_indexes_version, news_index_page_id, news_index_version, html = cached
+        if cached_indexes_version == indexes_version and (
+            news_index_page_id is None
+            or news_index_version == get_version(get_news_index_version_cache_key(news_index_page_id))
+        ):
+            return mark_safe(html)  # noqa: S308
+
+    news_index_page = page.get_news_index_page()
+    news_index_page_id = news_index_page.pk if news_index_page else None
+    # Read the version before the articles, so a publish part way through isn't cached as seen.
+    news_index_version = (
+        get_version(get_news_index_version_cache_key(news_index_page_id)) if news_index_page_id else None
+    )
+    html = render_recent_news_card(page, request, news_index_page)
+    cache.set(key, (indexes_version, news_index_page_id, news_index_version, html), NEWS_CACHE_TIMEOUT)
+    return mark_safe(html)  # noqa: S308
@@ -0,0 +1,71 @@
+import datetime
+
+from django.contrib.syndication.views import Feed
+from django.utils import timezone
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+
+FEED_ITEMS = 20
+FEED_TYPES = {"rss": Rss201rev2Feed, "atom": Atom1Feed}
+
+
+class NewsFeed(Feed):
+    """
+    The newest articles in a news index, optionally of a single news type. Items carry the
+    article's introduction, so the feed never loads article bodies.
+    """
+
+    def __init__(self, news_index_page, request, *, news_type=None, feed_type=Rss201rev2Feed):
+        self.news_index_page = news_index_page
+        self.request = request
+        self.news_type = news_type
+        self.feed_type = feed_type
+
+    def title(self):
+        if self.news_type:
+            return f"{self.news_index_page.title}: {self.news_type.name}"
+        return self.news_index_page.title
+
+    def link(self):
+        url = self.news_index_page.get_url(self.request)
+        return f"{url}?news_type={self.news_type.slug}" if self.news_type else url
+
+    def description(self):
+        return self.news_index_page.introduction
+
+    def items(self):
+        articles = self.news_index_page.get_articles(self.request)
+        if self.news_type:
+            articles = articles.filter(news_type=self.news_type)
+        return (
+            articles.defer_streamfields()
+            .select_related("author", "news_type")
+            .order_by("-sort_date", "-pk")[:FEED_ITEMS]
+        )
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.introduction
+
+    def item_link(self, item):
+        return item.get_url(self.request)
+
+    def item_pubdate(self, item):
+        if item.sort_date is None:
+            return None
+        return timezone.make_aware(datetime.datetime.combine(item.sort_date, datetime.time()))
+
+    def item_updateddate(self, item):
+        return item.last_published_at
+
+    def item_author_name(self, item):
+        return item.author.name if item.author else None
+
+    def item_categories(self, item):
+        return [item.news_type.name]
+
+    def render(self) -> tuple[str, str]:
+        """Return the feed's content type and its content."""
+        feed = self.get_feed(None, self.request)
+        return feed.content_type, feed.writeString("utf-8")
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0003_add_page_access_level"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="articlepage",
+            name="access_source_path",
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="articlepage",
+            name="effective_access_level",
+            field=models.CharField(
+                choices=[
+                    ("inherit", "Inherit"),
+                    ("logged_in", "Logged in only"),
+                    ("magic_link", "Magic link"),
+                    ("public", "Public"),
+                ],
+                db_index=True,
+                default="logged_in",
+                editable=False,
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="newsindexpage",
+            name="access_source_path",
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="newsindexpage",
+            name="effective_access_level",
+            field=models.CharField(
+                choices=[
+                    ("inherit", "Inherit"),
+                    ("logged_in", "Logged in only"),
+                    ("magic_link", "Magic link"),
+                    ("public", "Public"),
+                ],
+                db_index=True,
+                default="logged_in",
+                editable=False,
+                max_length=20,
+            ),
+        ),
+    ]
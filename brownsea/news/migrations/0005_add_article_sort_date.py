@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:42
+
+from django.db import migrations, models
+
+
+def populate_sort_date(apps, schema_editor):
+    ArticlePage = apps.get_model("news", "ArticlePage")
+    articles = list(ArticlePage.objects.only("publication_date", "first_published_at"))
+    for article in articles:
+        article.sort_date = article.publication_date or (
+            article.first_published_at.date() if article.first_published_at else None
+        )
+    ArticlePage.objects.bulk_update(articles, ["sort_date"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0004_add_effective_access_level"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="articlepage",
+            name="sort_date",
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="articlepage",
+            index=models.Index(fields=["-sort_date", "-page_ptr"], name="news_article_sort_date"),
+        ),
+        migrations.RunPython(populate_sort_date, migrations.RunPython.noop),
+    ]
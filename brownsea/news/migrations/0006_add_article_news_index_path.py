@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:52
+
+from django.db import migrations, models
+
+PATH_STEP_LENGTH = 4
+
+
+def populate_news_index_path(apps, schema_editor):
+    ArticlePage = apps.get_model("news", "ArticlePage")
+    articles = list(ArticlePage.objects.only("path"))
+    for article in articles:
+        article.news_index_path = article.path[:-PATH_STEP_LENGTH]
+    ArticlePage.objects.bulk_update(articles, ["news_index_path"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0005_add_article_sort_date"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="articlepage",
+            name="news_article_sort_date",
+        ),
+        migrations.AddField(
+            model_name="articlepage",
+            name="news_index_path",
+            field=models.CharField(default="", editable=False, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name="articlepage",
+            index=models.Index(fields=["news_index_path", "-sort_date", "-page_ptr"], name="news_article_listing"),
+        ),
+        migrations.AddIndex(
+            model_name="articlepage",
+            index=models.Index(
+                fields=["news_index_path", "news_type", "-sort_date", "-page_ptr"], name="news_article_type_listing"
+            ),
+        ),
+        migrations.RunPython(populate_news_index_path, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,6 @@
 from django.db import models
-from django.db.models.functions import Coalesce
 
+from brownsea.news.cache import get_recent_news_card
 from brownsea.news.models.pages import ArticlePage, NewsIndexPage
 
 
@@ -18,32 +18,30 @@ class RecentNewsMixin(models.Model):
 
     def get_context(self, request, *args, **kwargs):
         context = super().get_context(request, *args, **kwargs)
-        context["recent_news"] = self.get_recent_news()
-        context["news_index_page"] = self.get_news_index_page()
+        context["recent_news_card"] = get_recent_news_card(self, request)
         return context
 
+    def get_recent_news_card_context(self) -> dict:
+        """Return the extra template context for this page's recent news card."""
+        return {"article_type_plural": "news"}
+
     def get_news_index_page(self):
         if self.news_index_page:
             return self.news_index_page
         return self.get_children().type(NewsIndexPage).live().first()
 
-    def get_recent_news(self):
-        news_index_page = self.get_news_index_page()
+    def get_recent_news(self, request=None, *, news_index_page=None):
+        news_index_page = news_index_page or self.get_news_index_page()
         if news_index_page is None:
             return []
 
+        child_pages = ArticlePage.objects.live()
+        if request is not None:
+            child_pages = child_pages.visible_to(request)
+
         child_pages = (
-            ArticlePage.objects.live()
-            .filter(show_in_menus=True)
-            .descendant_of(news_index_page)
-            .annotate(
-                date=Coalesce(
-                    "publication_date",
-                    "first_published_at",
-                    output_field=models.DateField(),
-                )
-            )
+            child_pages.filter(show_in_menus=True, news_index_path=news_index_page.path)
             .select_related("news_type", "image")
-            .order_by("-date", "-first_published_at")
+            .order_by("-sort_date", "-pk")
         )
         return child_pages[:3]
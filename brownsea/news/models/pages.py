@@ -1,16 +1,19 @@
 import datetime
 
 from django.conf import settings
-from django.core.paginator import Paginator
 from django.db import models
-from django.db.models.functions import Coalesce
 from wagtail.admin.panels import FieldPanel, HelpPanel, MultiFieldPanel
 from wagtail.search import index
 
 from brownsea.core.blocks import StoryBlock
-from brownsea.core.models import BasePage, InPageNavMixin
+from brownsea.core.images import prefetch_renditions
+from brownsea.core.models import INTRODUCTION_SEARCH_BOOST, BasePage, InPageNavMixin
+from brownsea.core.pagination import KeysetPaginator
 from brownsea.core.utils import StreamField
 
+# The renditions components/news_card.html shows for an article's image.
+NEWS_CARD_RENDITIONS = ("width-800", "width-200")
+
 
 class ArticlePage(InPageNavMixin, BasePage):
     template = "pages/news/article_page.html"
@@ -46,6 +49,10 @@ class ArticlePage(InPageNavMixin, BasePage):
         help_text="The introduction for this article. Will be shown in article listings.",
     )
     body = StreamField(StoryBlock())
+    # The display date, stored so listings can order by and page through it with an index.
+    sort_date = models.DateField(null=True, editable=False)
+    # The tree path of the news index the article is in, stored so listings can filter by it with an index.
+    news_index_path = models.CharField(max_length=255, editable=False, default="")
 
     content_panels = BasePage.content_panels + [
         FieldPanel("author"),
@@ -63,10 +70,18 @@ class ArticlePage(InPageNavMixin, BasePage):
         FieldPanel("publication_date"),
     ] + BasePage.promote_panels
     search_fields = BasePage.search_fields + [
-        index.SearchField("introduction"),
+        index.SearchField("introduction", boost=INTRODUCTION_SEARCH_BOOST),
         index.SearchField("body"),
     ]
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["news_index_path", "-sort_date", "-page_ptr"], name="news_article_listing"),
+            models.Index(
+                fields=["news_index_path", "news_type", "-sort_date", "-page_ptr"], name="news_article_type_listing"
+            ),
+        ]
+
     @property
     def display_date(self) -> datetime.date | None:
         if self.publication_date:
@@ -75,6 +90,27 @@ class ArticlePage(InPageNavMixin, BasePage):
             return self.first_published_at.date()
         return None
 
+    # Fields kept in step with the fields they're worked out from, for saves with update_fields.
+    derived_fields = {
+        "sort_date": {"publication_date", "first_published_at"},
+        "news_index_path": {"path"},
+    }
+
+    def get_news_index_path(self) -> str:
+        # Articles only ever live directly inside a news index.
+        return self.path[: -self.steplen]
+
+    def save(self, *args, **kwargs):
+        self.sort_date = self.display_date
+        self.news_index_path = self.get_news_index_path()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {
+                *update_fields,
+                *(field for field, sources in self.derived_fields.items() if sources & set(update_fields)),
+            }
+        return super().save(*args, **kwargs)
+
 
 class NewsIndexPage(BasePage):
     template = "pages/news/news_index_page.html"
@@ -86,31 +122,30 @@ class NewsIndexPage(BasePage):
         FieldPanel("introduction"),
         HelpPanel("All child articles will be listed."),
     ]
-    search_fields = BasePage.search_fields + [index.SearchField("introduction")]
-
-    def get_context(self, request):
-        context = super().get_context(request)
+    search_fields = BasePage.search_fields + [index.SearchField("introduction", boost=INTRODUCTION_SEARCH_BOOST)]
 
-        child_pages = (
+    def get_articles(self, request):
+        # Listings page by cursors over the sort date, which can't name an article without one.
+        return (
             ArticlePage.objects.live()
-            .filter(show_in_menus=True)
-            .descendant_of(self)
-            .annotate(
-                date=Coalesce(
-                    "publication_date",
-                    "first_published_at",
-                    output_field=models.DateField(),
-                )
-            )
-            .select_related("author", "news_type")
-            .order_by("-date", "-first_published_at")
+            .filter(show_in_menus=True, news_index_path=self.path, sort_date__isnull=False)
+            .visible_to(request)
         )
 
-        page_number = request.GET.get("page")
-        paginator = Paginator(
-            child_pages,
-            per_page=settings.APP_SEARCH_RESULTS_PER_PAGE,
+    def get_context(self, request):
+        from brownsea.news.archive import filter_articles, get_archive, get_selected_archive
+        from brownsea.news.cache import get_archive_rows
+
+        context = super().get_context(request)
+
+        selected = get_selected_archive(request)
+        child_pages = filter_articles(self.get_articles(request), selected).select_related(
+            "author", "news_type", "image"
         )
 
-        context["sub_pages"] = paginator.get_page(page_number)
+        paginator = KeysetPaginator(child_pages, per_page=settings.APP_SEARCH_RESULTS_PER_PAGE, field="sort_date")
+        context["sub_pages"] = paginator.get_page(after=request.GET.get("after"), before=request.GET.get("before"))
+        prefetch_renditions(context["sub_pages"], *NEWS_CARD_RENDITIONS)
+        context["archive"] = get_archive(get_archive_rows(self, request), selected)
+        context["selected_archive"] = selected
         return context
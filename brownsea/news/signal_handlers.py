@@ -0,0 +1,39 @@
+from django.db.models.signals import post_delete
+from wagtail.models import Page
+from wagtail.signals import page_published, page_unpublished, post_page_move
+
+from brownsea.news.cache import bump_news_index_versions, bump_news_indexes_version
+from brownsea.news.models import ArticlePage, NewsIndexPage
+
+
+def bump_recent_news_on_change(sender, instance, **kwargs):
+    # Publishing also covers access level changes, which decide who can see an article, and an
+    # ancestor's access level reaches every article below it.
+    if isinstance(instance, Page):
+        bump_news_index_versions(instance)
+    if isinstance(instance, NewsIndexPage):
+        bump_news_indexes_version()
+
+
+def update_news_index_paths_on_move(sender, instance, **kwargs):
+    # Treebeard rewrites the paths of the moved subtree in SQL, without saving the articles in it.
+    moved = Page.objects.get(pk=instance.pk)
+    articles = list(ArticlePage.objects.descendant_of(moved, inclusive=True).only("path"))
+    for article in articles:
+        article.news_index_path = article.get_news_index_path()
+    ArticlePage.objects.bulk_update(articles, ["news_index_path"], batch_size=500)
+
+
+def bump_recent_news_on_move(sender, instance, **kwargs):
+    # The moved subtree may carry articles or whole news indexes between landing pages.
+    bump_news_indexes_version()
+
+
+def register_signal_handlers():
+    for signal in (page_published, page_unpublished):
+        signal.connect(bump_recent_news_on_change)
+    post_page_move.connect(update_news_index_paths_on_move)
+    post_page_move.connect(bump_recent_news_on_move)
+
+    for model in (ArticlePage, NewsIndexPage):
+        post_delete.connect(bump_recent_news_on_change, sender=model)
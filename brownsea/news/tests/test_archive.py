@@ -0,0 +1,130 @@
+import datetime
+
+import pytest
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from brownsea.factories import ArticlePageFactory, NewsIndexPageFactory, NewsTypeFactory, publish
+from brownsea.news.archive import get_archive, get_selected_archive
+from brownsea.news.models import ArticlePage
+
+ROWS = [
+    (2025, 3, "camps", "Camps", 2),
+    (2025, 3, "awards", "Awards", 1),
+    (2025, 1, "camps", "Camps", 1),
+    (2024, 12, "awards", "Awards", 4),
+]
+
+
+def test_archive_counts_each_dimension_with_the_others_selection_applied():
+    archive = get_archive(ROWS, {"year": 2025, "month": 3, "news_type": "camps"})
+
+    assert [(year.year, year.count) for year in archive["years"]] == [(2025, 3)]
+    assert [(month.date.month, month.count, month.selected) for month in archive["years"][0].months] == [
+        (3, 2, True),
+        (1, 1, False),
+    ]
+    assert [(option.slug, option.count, option.selected) for option in archive["news_types"]] == [
+        ("awards", 1, False),
+        ("camps", 2, True),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ({"year": "2025", "month": "3"}, (2025, 3)),
+        ({"year": "2025"}, (2025, None)),
+        ({"year": "2025", "month": "13"}, (2025, None)),
+        ({"year": "nope", "month": "3"}, (None, None)),
+        ({"year": "99999999999999999999"}, (None, None)),
+        ({"year": "0"}, (None, None)),
+        ({"month": "3"}, (None, None)),
+    ],
+)
+def test_invalid_archive_selections_are_ignored(query, expected):
+    selected = get_selected_archive(RequestFactory().get("/", query))
+
+    assert (selected["year"], selected["month"]) == expected
+
+
+@pytest.fixture
+def news(site_tree):
+    news = publish(NewsIndexPageFactory(parent=site_tree["home"]))
+    camps, awards = NewsTypeFactory(name="Camps", slug="camps"), NewsTypeFactory(name="Awards", slug="awards")
+    for slug, news_type, date in [
+        ("spring-camp", camps, datetime.date(2025, 3, 14)),
+        ("chief-scout-award", awards, datetime.date(2025, 3, 2)),
+        ("winter-camp", camps, datetime.date(2025, 1, 20)),
+        ("annual-awards", awards, datetime.date(2024, 12, 1)),
+    ]:
+        publish(
+            ArticlePageFactory(parent=news, slug=slug, news_type=news_type, publication_date=date, show_in_menus=True)
+        )
+    return news
+
+
+def get_archive_queries(context):
+    return [query["sql"] for query in context.captured_queries if "GROUP BY" in query["sql"]]
+
+
+@pytest.mark.django_db
+def test_news_index_filters_by_month_and_news_type(authenticated_client, news):
+    response = authenticated_client.get(news.url, {"year": 2025, "month": 3, "news_type": "camps"})
+
+    assert [article.slug for article in response.context["sub_pages"]] == ["spring-camp"]
+    archive = response.context["archive"]
+    assert [(year.year, year.count) for year in archive["years"]] == [(2025, 2)]
+    assert [(option.slug, option.count) for option in archive["news_types"]] == [("awards", 1), ("camps", 1)]
+
+    response = authenticated_client.get(news.url, {"year": 2025})
+
+    assert [article.slug for article in response.context["sub_pages"]] == [
+        "spring-camp",
+        "chief-scout-award",
+        "winter-camp",
+    ]
+
+
+@pytest.mark.django_db
+def test_news_index_says_when_no_articles_match_the_filters(authenticated_client, news):
+    response = authenticated_client.get(news.url, {"year": 2020})
+
+    assert not response.context["sub_pages"]
+    assert "No articles match these filters." in response.content.decode()
+
+
+@pytest.mark.parametrize("query", [{"year": 9999}, {"year": 9999, "month": 12}, {"year": 99999999999999999999}])
+@pytest.mark.django_db
+def test_out_of_range_years_do_not_break_the_news_index(authenticated_client, news, query):
+    response = authenticated_client.get(news.url, query)
+
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_archive_counts_are_cached_until_an_article_is_published(authenticated_client, news):
+    with CaptureQueriesContext(connection) as context:
+        authenticated_client.get(news.url)
+    assert len(get_archive_queries(context)) == 1
+
+    with CaptureQueriesContext(connection) as context:
+        authenticated_client.get(news.url)
+    assert get_archive_queries(context) == []
+
+    publish(ArticlePageFactory(parent=news, publication_date=datetime.date(2023, 6, 1), show_in_menus=True))
+    response = authenticated_client.get(news.url)
+
+    assert [year.year for year in response.context["archive"]["years"]] == [2025, 2024, 2023]
+
+
+@pytest.mark.django_db
+def test_moving_an_article_updates_its_news_index_path(site_tree, news):
+    other_news = publish(NewsIndexPageFactory(parent=site_tree["home"]))
+    article = ArticlePage.objects.get(slug="spring-camp")
+    assert article.news_index_path == news.path
+
+    article.move(other_news, pos="last-child")
+
+    assert ArticlePage.objects.get(pk=article.pk).news_index_path == other_news.path
@@ -0,0 +1,110 @@
+import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from brownsea.factories import ArticlePageFactory, NewsIndexPageFactory, NewsTypeFactory, publish
+
+
+@pytest.fixture
+def news(site_tree):
+    news = publish(NewsIndexPageFactory(parent=site_tree["home"], title="Group news"))
+    camps, awards = NewsTypeFactory(name="Camps", slug="camps"), NewsTypeFactory(name="Awards", slug="awards")
+    publish(
+        ArticlePageFactory(
+            parent=news,
+            title="Spring camp",
+            news_type=camps,
+            publication_date=datetime.date(2025, 3, 14),
+            show_in_menus=True,
+        )
+    )
+    publish(
+        ArticlePageFactory(
+            parent=news,
+            title="Chief Scout award",
+            news_type=awards,
+            publication_date=datetime.date(2025, 3, 2),
+            show_in_menus=True,
+        )
+    )
+    return news
+
+
+def get_feed_url(news, feed_format="rss"):
+    return reverse("news:news_feed", args=[news.pk, feed_format])
+
+
+@pytest.mark.django_db
+def test_feeds_list_the_newest_articles(authenticated_client, news):
+    response = authenticated_client.get(get_feed_url(news))
+
+    assert response["Content-Type"].startswith("application/rss+xml")
+    content = response.content.decode()
+    assert content.index("Spring camp") < content.index("Chief Scout award")
+    assert response["ETag"] and response["Last-Modified"]
+
+    response = authenticated_client.get(get_feed_url(news, "atom"))
+
+    assert response["Content-Type"].startswith("application/atom+xml")
+    assert "<title>Group news</title>" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_news_type_feeds_only_list_that_type(authenticated_client, news):
+    response = authenticated_client.get(reverse("news:news_type_feed", args=[news.pk, "camps", "atom"]))
+
+    content = response.content.decode()
+    assert "Spring camp" in content
+    assert "Chief Scout award" not in content
+
+
+@pytest.mark.django_db
+def test_unknown_feeds_are_not_found(authenticated_client, news):
+    assert authenticated_client.get(get_feed_url(news, "json")).status_code == 404
+    assert authenticated_client.get(reverse("news:news_type_feed", args=[news.pk, "nope", "rss"])).status_code == 404
+
+
+@pytest.mark.django_db
+def test_unchanged_polls_get_a_304_without_loading_articles(authenticated_client, news):
+    etag = authenticated_client.get(get_feed_url(news))["ETag"]
+
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_client.get(get_feed_url(news), headers={"if-none-match": etag})
+
+    assert response.status_code == 304
+    assert not [query for query in context.captured_queries if '"news_articlepage"."introduction"' in query["sql"]]
+
+
+@pytest.mark.django_db
+def test_feeds_are_cached_until_an_article_is_published(authenticated_client, news):
+    etag = authenticated_client.get(get_feed_url(news))["ETag"]
+
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_client.get(get_feed_url(news))
+    assert response.status_code == 200
+    assert not [query for query in context.captured_queries if '"news_articlepage"."introduction"' in query["sql"]]
+
+    publish(ArticlePageFactory(parent=news, title="Summer camp", show_in_menus=True))
+    response = authenticated_client.get(get_feed_url(news), headers={"if-none-match": etag})
+
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    assert "Summer camp" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_feeds_never_load_article_bodies(authenticated_client, news):
+    with CaptureQueriesContext(connection) as context:
+        authenticated_client.get(get_feed_url(news))
+
+    assert not [query for query in context.captured_queries if '"news_articlepage"."body"' in query["sql"]]
+
+
+@pytest.mark.django_db
+def test_news_index_links_to_its_feeds(authenticated_client, news):
+    content = authenticated_client.get(news.url).content.decode()
+
+    assert f'href="{get_feed_url(news, "atom")}"' in content
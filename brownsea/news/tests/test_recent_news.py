@@ -0,0 +1,61 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from brownsea.factories import ArticlePageFactory, NewsIndexPageFactory, publish
+from brownsea.topics.models import TopicPage
+
+
+@pytest.fixture
+def news(site_tree):
+    news = publish(NewsIndexPageFactory(parent=site_tree["home"]))
+    publish(ArticlePageFactory(parent=news, title="Camp report", show_in_menus=True))
+    return news
+
+
+def get_news_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    news_tables = ('"news_articlepage"', '"news_newsindexpage"')
+    return response, [
+        query["sql"] for query in context.captured_queries if any(table in query["sql"] for table in news_tables)
+    ]
+
+
+@pytest.mark.django_db
+def test_warm_landing_pages_make_no_news_queries(authenticated_client, site_tree, news):
+    response, queries = get_news_queries(authenticated_client, site_tree["home"].url)
+    assert "Camp report" in response.content.decode()
+    assert queries
+
+    response, queries = get_news_queries(authenticated_client, site_tree["home"].url)
+    assert "Camp report" in response.content.decode()
+    assert queries == []
+
+
+@pytest.mark.django_db
+def test_publishing_and_unpublishing_articles_refreshes_the_card(authenticated_client, site_tree, news):
+    authenticated_client.get(site_tree["home"].url)
+
+    article = publish(ArticlePageFactory(parent=news, title="Hike report", show_in_menus=True))
+    assert "Hike report" in authenticated_client.get(site_tree["home"].url).content.decode()
+
+    article.unpublish()
+    assert "Hike report" not in authenticated_client.get(site_tree["home"].url).content.decode()
+
+
+@pytest.mark.django_db
+def test_moving_articles_refreshes_the_card(authenticated_client, site_tree, news):
+    topic = TopicPage(title="Camping", slug="camping", introduction="Camping", news_content_type_plural="updates")
+    topic = publish(site_tree["home"].add_child(instance=topic))
+    topic_news = publish(NewsIndexPageFactory(parent=topic))
+    article = publish(ArticlePageFactory(parent=topic_news, title="Kit list", show_in_menus=True))
+    content = authenticated_client.get(topic.url).content.decode()
+    assert "Kit list" in content
+    assert "Recent Updates" in content
+
+    article.move(news, pos="last-child")
+
+    assert "Kit list" not in authenticated_client.get(topic.url).content.decode()
+    assert "Kit list" in authenticated_client.get(site_tree["home"].url).content.decode()
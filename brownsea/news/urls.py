@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import views
+
+app_name = "news"
+
+urlpatterns = [
+    path("<int:page_id>/<str:feed_format>/", views.news_feed, name="news_feed"),
+    path("<int:page_id>/<slug:news_type>/<str:feed_format>/", views.news_feed, name="news_type_feed"),
+]
@@ -0,0 +1,64 @@
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_GET
+
+from brownsea.core.access import get_visibility_filter
+from brownsea.news.cache import NEWS_CACHE_TIMEOUT, NEWS_FEED_CACHE_PREFIX, get_visibility_digest
+from brownsea.news.feeds import FEED_TYPES, NewsFeed
+from brownsea.news.models import NewsIndexPage, NewsType
+
+
+@require_GET
+def news_feed(request, page_id, feed_format, news_type=None):
+    """
+    Serve an RSS or Atom feed of a news index, optionally of one news type. The ETag and
+    Last-Modified come from the latest publish time of the articles in the feed, so an unchanged
+    poll gets a 304 after one aggregate query, and the rendered feed is cached until it changes.
+    """
+    if feed_format not in FEED_TYPES:
+        raise Http404
+    news_index_page = get_object_or_404(NewsIndexPage.objects.live().filter(get_visibility_filter(request)), pk=page_id)
+    if news_type is not None:
+        news_type = get_object_or_404(NewsType, slug=news_type)
+
+    articles = news_index_page.get_articles(request)
+    if news_type is not None:
+        articles = articles.filter(news_type=news_type)
+    state = articles.aggregate(latest=Max("last_published_at"), count=Count("pk"))
+
+    # Unpublishing an older article leaves the latest publish time alone, but not the count.
+    parts = [
+        feed_format,
+        str(news_index_page.pk),
+        str(news_index_page.last_published_at),
+        news_type.slug if news_type else "",
+        str(state["latest"]),
+        str(state["count"]),
+        get_visibility_digest(request),
+    ]
+    etag = quote_etag(hashlib.sha256("\0".join(parts).encode()).hexdigest())
+    last_modified = max(filter(None, [state["latest"], news_index_page.last_published_at]), default=None)
+    last_modified = int(last_modified.timestamp()) if last_modified else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        key = f"{NEWS_FEED_CACHE_PREFIX}:{etag}"
+        feed = cache.get(key)
+        if feed is None:
+            feed = NewsFeed(news_index_page, request, news_type=news_type, feed_type=FEED_TYPES[feed_format]).render()
+            cache.set(key, feed, NEWS_CACHE_TIMEOUT)
+        content_type, content = feed
+        response = HttpResponse(content, content_type=content_type)
+
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+    # Readers must check back rather than trust a stale copy, and feeds can differ by viewer.
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
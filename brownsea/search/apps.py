@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "brownsea.search"
+
+    def ready(self):
+        from brownsea.search.signal_handlers import register_signal_handlers
+
+        register_signal_handlers()
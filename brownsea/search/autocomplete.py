@@ -0,0 +1,34 @@
+from django.db.models import Case, IntegerField, Value, When
+from django.db.models.functions import Length
+from wagtail.models import Page
+
+from brownsea.core.access import get_visibility_filter
+from brownsea.search.cache import normalize_query
+
+AUTOCOMPLETE_LIMIT = 8
+AUTOCOMPLETE_MIN_LENGTH = 2
+
+
+def get_title_suggestions(prefix: str, request, *, scope=None, limit: int = AUTOCOMPLETE_LIMIT) -> list[Page]:
+    """
+    Return up to ``limit`` live pages the viewer may see whose titles contain every word of
+    ``prefix``, titles starting with it first. This reads only the page table, where the title
+    trigram index serves the matching on PostgreSQL, and never the search backend.
+    """
+    prefix = normalize_query(prefix)
+    if len(prefix) < AUTOCOMPLETE_MIN_LENGTH:
+        return []
+
+    pages = Page.objects.live().filter(depth__gt=1).filter(get_visibility_filter(request))
+    if scope is not None:
+        pages = pages.filter(path__startswith=scope.path)
+    for word in prefix.split():
+        pages = pages.filter(title__icontains=word)
+
+    return list(
+        pages.annotate(
+            starts_with_prefix=Case(
+                When(title__istartswith=prefix, then=Value(0)), default=Value(1), output_field=IntegerField()
+            )
+        ).order_by("starts_with_prefix", Length("title"), "title")[:limit]
+    )
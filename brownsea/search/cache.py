@@ -0,0 +1,61 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+
+SEARCH_VERSION_CACHE_KEY = "brownsea:search-content-version"
+SEARCH_RESULTS_CACHE_PREFIX = "brownsea:search-results"
+SEARCH_RESULTS_TIMEOUT = 60 * 60
+# Nobody pages past the first few hundred hits, so don't hold on to the long tail.
+SEARCH_RESULTS_LIMIT = 500
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def get_search_content_version() -> int:
+    version = cache.get(SEARCH_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(SEARCH_VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+        version = cache.get(SEARCH_VERSION_CACHE_KEY)
+    # Without a working cache nothing is ever found in it either.
+    return version if version is not None else time.time_ns()
+
+
+def bump_search_content_version() -> None:
+    cache.set(SEARCH_VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+
+
+def get_search_cache_key(query: str, *, scope: str = "", request=None) -> str:
+    from brownsea.core.access import get_visibility_filter
+
+    # Anonymous visitors only search what they may view, which depends on their magic links.
+    visibility = str(get_visibility_filter(request)) if request is not None else ""
+    parts = [query, scope, visibility]
+    digest = hashlib.sha256("\0".join(parts).encode()).hexdigest()
+    return f"{SEARCH_RESULTS_CACHE_PREFIX}:{get_search_content_version()}:{digest}"
+
+
+def get_search_hits(query: str, search, *, scope: str = "", request=None) -> tuple[list[tuple], bool]:
+    """
+    Return the pages ``search(query)`` finds, in ranked order, as (page id, *facet values)
+    rows, and whether it found more than the ``SEARCH_RESULTS_LIMIT`` kept. They are cached for
+    the normalized query, the scope (e.g. a topic's path) and the viewer's access until the
+    site's content next changes, so repeating a search, paging through it or narrowing it by
+    facet doesn't touch the search backend or the pages again.
+    """
+    from brownsea.search.facets import describe_hits
+
+    query = normalize_query(query)
+    if not query:
+        return [], False
+
+    key = get_search_cache_key(query, scope=scope, request=request)
+    cached = cache.get(key)
+    if cached is None:
+        # One past the limit tells whether there were more.
+        page_ids = [page.pk for page in search(query)[: SEARCH_RESULTS_LIMIT + 1]]
+        cached = (describe_hits(page_ids[:SEARCH_RESULTS_LIMIT]), len(page_ids) > SEARCH_RESULTS_LIMIT)
+        cache.set(key, cached, SEARCH_RESULTS_TIMEOUT)
+    return cached
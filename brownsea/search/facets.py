@@ -0,0 +1,79 @@
+from collections import Counter
+from dataclasses import dataclass
+
+from django.contrib.contenttypes.models import ContentType
+from wagtail.models import Page
+
+FACET_PARAMETERS = ("type", "news_type")
+
+
+@dataclass(frozen=True)
+class FacetOption:
+    value: str
+    label: str
+    count: int
+    selected: bool
+
+
+def describe_hits(page_ids: list[int]) -> list[tuple[int, int, str, str]]:
+    """
+    Return (page id, content type id, news type slug, news type name) for each of ``page_ids``
+    in their original order, from a single query. Pages that aren't articles have no news type.
+    """
+    rows = {
+        page_id: (content_type_id, news_type_slug or "", news_type_name or "")
+        for page_id, content_type_id, news_type_slug, news_type_name in Page.objects.filter(
+            pk__in=page_ids
+        ).values_list("pk", "content_type_id", "articlepage__news_type__slug", "articlepage__news_type__name")
+    }
+    return [(page_id, *rows[page_id]) for page_id in page_ids if page_id in rows]
+
+
+def get_selected_facets(request) -> dict[str, str]:
+    return {parameter: request.GET.get(parameter, "") for parameter in FACET_PARAMETERS}
+
+
+def _get_type_value(content_type_id: int) -> str:
+    # ContentType caches its lookups for the life of the process.
+    return ContentType.objects.get_for_id(content_type_id).model
+
+
+def _matches(hit, selected, *, ignore=None) -> bool:
+    _page_id, content_type_id, news_type_slug, _news_type_name = hit
+    if ignore != "type" and selected["type"] and _get_type_value(content_type_id) != selected["type"]:
+        return False
+    return ignore == "news_type" or not selected["news_type"] or news_type_slug == selected["news_type"]
+
+
+def filter_hits(hits, selected) -> list[int]:
+    """Return the ids of the ``hits`` matching every selected facet, keeping their ranking."""
+    return [hit[0] for hit in hits if _matches(hit, selected)]
+
+
+def get_facets(hits, selected) -> dict[str, list[FacetOption]]:
+    """
+    Count the ``hits`` under each facet option. Each facet is counted with the other facets'
+    selections applied, so its counts say how many results choosing that option would show.
+    """
+    type_counts = Counter(hit[1] for hit in hits if _matches(hit, selected, ignore="type"))
+    news_type_counts = Counter(
+        (hit[2], hit[3]) for hit in hits if hit[2] and _matches(hit, selected, ignore="news_type")
+    )
+
+    types = []
+    for content_type_id, count in type_counts.items():
+        content_type = ContentType.objects.get_for_id(content_type_id)
+        model = content_type.model_class()
+        label = model._meta.verbose_name.title() if model is not None else content_type.name
+        types.append(FacetOption(content_type.model, label, count, content_type.model == selected["type"]))
+
+    return {
+        "type": sorted(types, key=lambda option: (-option.count, option.label)),
+        "news_type": sorted(
+            (
+                FacetOption(slug, name, count, slug == selected["news_type"])
+                for (slug, name), count in news_type_counts.items()
+            ),
+            key=lambda option: (-option.count, option.label),
+        ),
+    }
@@ -0,0 +1,104 @@
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
+from modelsearch.backends import get_search_backend
+from modelsearch.conf import get_app_config
+from modelsearch.index import get_indexed_instance
+from wagtail.models import Page
+
+from brownsea.search.cache import bump_search_content_version
+from brownsea.search.models import IndexQueueEntry
+
+logger = logging.getLogger(__name__)
+
+QUEUE_BATCH_SIZE = 500
+QUEUE_SETTLE_SECONDS = 5
+
+
+def get_queued_backend_names() -> list[str]:
+    """
+    Return the search backends whose index updates go through the queue. These are the ones with
+    ``AUTO_UPDATE`` turned off, which stops Wagtail updating them within the request.
+    """
+    return [
+        name
+        for name, params in get_app_config().get_search_backend_config().items()
+        if params.get("AUTO_UPDATE", True) is False
+    ]
+
+
+def get_queued_backends():
+    return [get_search_backend(name) for name in get_queued_backend_names()]
+
+
+def get_content_type_id(instance) -> int:
+    # Pages know their specific type without loading it.
+    if isinstance(instance, Page):
+        return instance.content_type_id
+    return ContentType.objects.get_for_model(instance).pk
+
+
+def queue_index_update(instance) -> None:
+    """
+    Queue ``instance`` to be reindexed by the worker. Queueing it again before then only moves
+    its entry on, so an object saved several times in quick succession is indexed once.
+    """
+    IndexQueueEntry.objects.bulk_create(
+        [IndexQueueEntry(content_type_id=get_content_type_id(instance), object_id=str(instance.pk))],
+        update_conflicts=True,
+        unique_fields=["content_type", "object_id"],
+        update_fields=["queued_at"],
+    )
+
+
+def remove_from_index(instance, backends) -> None:
+    IndexQueueEntry.objects.filter(content_type_id=get_content_type_id(instance), object_id=str(instance.pk)).delete()
+
+    indexed_instance = get_indexed_instance(instance, check_exists=False)
+    if indexed_instance is not None:
+        for backend in backends:
+            backend.delete(indexed_instance)
+
+
+def process_index_queue(*, batch_size=QUEUE_BATCH_SIZE, settle_seconds=QUEUE_SETTLE_SECONDS) -> int:
+    """
+    Index up to ``batch_size`` queued objects that haven't changed for ``settle_seconds``, with one
+    bulk insert per model into each queued backend. Returns the number of queue entries handled.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settle_seconds)
+    entries = list(
+        IndexQueueEntry.objects.filter(queued_at__lte=cutoff)
+        .order_by("queued_at")
+        .values_list("pk", "content_type_id", "object_id")[:batch_size]
+    )
+    if not entries:
+        return 0
+
+    object_ids = defaultdict(list)
+    for _pk, content_type_id, object_id in entries:
+        object_ids[content_type_id].append(object_id)
+
+    backends = get_queued_backends()
+    for content_type_id, ids in object_ids.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model is None:
+            continue
+        # Anything deleted since it was queued has already been removed from the index.
+        objects = list(model.get_indexed_objects().filter(pk__in=ids))
+        for backend in backends:
+            backend.add_bulk(model, objects)
+
+    # Entries queued again while we worked are left for the next batch.
+    IndexQueueEntry.objects.filter(pk__in=[pk for pk, _, _ in entries], queued_at__lte=cutoff).delete()
+    # Cached results were ranked against the old index.
+    bump_search_content_version()
+    return len(entries)
+
+
+def clear_index_queue(before) -> int:
+    """Drop entries queued before ``before``, e.g. as a full rebuild will cover them."""
+    deleted, _ = IndexQueueEntry.objects.filter(queued_at__lt=before).delete()
+    return deleted
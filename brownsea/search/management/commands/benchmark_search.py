@@ -0,0 +1,112 @@
+import random
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from wagtail.models import Site
+from wagtail.search.backends import get_search_backend
+
+from brownsea.search.indexing import get_queued_backend_names
+from brownsea.standard_pages.models import InfoPage
+
+FALLBACK_BACKEND = "modelsearch.backends.database.fallback"
+INDEX_CHUNK_SIZE = 500
+
+WORDS = (
+    "activity badge beaver camp campfire canoe compass cub explorer hike kit leader map meeting "
+    "network parent permit programme rota safeguarding scout section shelter skills tent troop uniform "
+    "volunteer water weekend young"
+).split()
+
+DEFAULT_QUERIES = ["risk assessment", "kit list", "camp permit", "first aid"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Time searches with the configured backend against the generic database fallback, over a "
+        "synthetic corpus that is created inside a transaction and rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", type=int, default=50_000, help="Size of the synthetic corpus.")
+        parser.add_argument("--repeat", type=int, default=5, help="Times to run each query.")
+        parser.add_argument("--query", action="append", dest="queries", help="A query to time (repeatable).")
+        parser.add_argument("--seed", type=int, default=1907)
+        parser.add_argument("--keep", action="store_true", help="Keep the synthetic pages afterwards.")
+
+    def handle(self, *args, **options):
+        queries = options["queries"] or DEFAULT_QUERIES
+        backends = {"configured": get_search_backend("default"), "fallback": get_search_backend(FALLBACK_BACKEND)}
+
+        with transaction.atomic():
+            corpus_root = self.build_corpus(options["pages"], queries, random.Random(options["seed"]))  # noqa: S311
+            pages = InfoPage.objects.live().descendant_of(corpus_root)
+            if "default" in get_queued_backend_names():
+                # With the index queue on, saving the corpus only queued it for the worker.
+                self.index_corpus(backends["configured"], pages)
+
+            self.stdout.write(f"{connection.vendor}, {options['pages']} pages, {options['repeat']} runs per query")
+            self.stdout.write(f"{'query':<24}{'backend':<12}{'hits':>6}{'median ms':>12}{'p95 ms':>10}")
+            for query in queries:
+                for name, backend in backends.items():
+                    hits, timings = self.time_query(backend, query, pages, options["repeat"])
+                    self.stdout.write(
+                        f"{query:<24}{name:<12}{hits:>6}{statistics.median(timings):>12.1f}"
+                        f"{self.percentile(timings, 95):>10.1f}"
+                    )
+
+            if not options["keep"]:
+                transaction.set_rollback(True)
+
+    def build_corpus(self, count, queries, rng):
+        root_page = Site.objects.get(is_default_site=True).root_page
+        corpus_root = root_page.add_child(
+            instance=InfoPage(
+                title="Search benchmark",
+                slug=f"search-benchmark-{uuid.uuid4().hex[:8]}",
+                introduction="Synthetic pages created by the benchmark_search command.",
+            )
+        )
+
+        def text(length):
+            words = rng.choices(WORDS, k=length)
+            # Roughly one page in fifty mentions each query, in one place or another.
+            if rng.random() < len(queries) / 50:
+                words.insert(rng.randrange(length), rng.choice(queries))
+            return " ".join(words)
+
+        started = time.perf_counter()
+        for number in range(1, count + 1):
+            corpus_root.add_child(
+                instance=InfoPage(
+                    title=text(4).capitalize(),
+                    slug=f"page-{number}",
+                    introduction=text(30),
+                    body=[("text", f"<p>{text(400)}</p>")],
+                )
+            )
+            if number % 1000 == 0:
+                self.stdout.write(f"Created {number} pages in {time.perf_counter() - started:.0f}s")
+        return corpus_root
+
+    def index_corpus(self, backend, pages):
+        started = time.perf_counter()
+        pks = list(pages.order_by("pk").values_list("pk", flat=True))
+        for start in range(0, len(pks), INDEX_CHUNK_SIZE):
+            chunk = InfoPage.get_indexed_objects().filter(pk__in=pks[start : start + INDEX_CHUNK_SIZE])
+            backend.add_bulk(InfoPage, list(chunk))
+        self.stdout.write(f"Indexed {len(pks)} pages in {time.perf_counter() - started:.0f}s")
+
+    def time_query(self, backend, query, pages, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            hits = len(list(backend.search(query, pages)[:10]))
+            timings.append((time.perf_counter() - started) * 1000)
+        return hits, timings
+
+    def percentile(self, timings, percent):
+        ordered = sorted(timings)
+        return ordered[min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))]
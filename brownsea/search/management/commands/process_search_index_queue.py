@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from brownsea.search.indexing import QUEUE_BATCH_SIZE, QUEUE_SETTLE_SECONDS, process_index_queue
+
+
+class Command(BaseCommand):
+    help = "Index the objects queued by saves while SEARCH_INDEX_QUEUE is on, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=QUEUE_BATCH_SIZE, help="Objects to index per batch.")
+        parser.add_argument(
+            "--settle-seconds",
+            type=int,
+            default=QUEUE_SETTLE_SECONDS,
+            help="Wait until an object hasn't been saved for this long (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=None,
+            help="Keep running as a worker, checking the queue every this many seconds once it is empty.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = 0
+            while batch := process_index_queue(
+                batch_size=options["batch_size"], settle_seconds=options["settle_seconds"]
+            ):
+                processed += batch
+
+            if options["interval"] is None:
+                self.stdout.write(f"Processed {processed} queued object(s).")
+                return
+            if processed:
+                self.stdout.write(f"Processed {processed} queued object(s).")
+            time.sleep(options["interval"])
@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.utils import timezone
+from modelsearch.backends import get_search_backends_with_name
+from modelsearch.index import get_indexed_models
+from modelsearch.management.commands.rebuild_modelsearch_index import group_models_by_index
+
+from brownsea.search.cache import bump_search_content_version
+from brownsea.search.indexing import clear_index_queue
+
+
+def get_chunks(model, chunk_size):
+    pks = list(model.get_indexed_objects().order_by("pk").values_list("pk", flat=True))
+    return [pks[start : start + chunk_size] for start in range(0, len(pks), chunk_size)]
+
+
+def index_chunk(index, model, pks) -> int:
+    objects = list(model.get_indexed_objects().filter(pk__in=pks))
+    index.add_items(model, objects)
+    return len(objects)
+
+
+def index_chunk_in_thread(index, model, pks) -> int:
+    try:
+        return index_chunk(index, model, pks)
+    finally:
+        # Each worker thread opens its own connection.
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search indexes, indexing chunks of objects in parallel."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--backend", default=None, help="Only rebuild this backend.")
+        parser.add_argument("--chunk-size", type=int, default=500, help="Objects to index per chunk.")
+        parser.add_argument("--workers", type=int, default=4, help="Chunks to index at once (default: %(default)s).")
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        if connection.vendor == "sqlite" and workers > 1:
+            # SQLite only allows one writer at a time.
+            self.stdout.write("SQLite can't index in parallel, using one worker.")
+            workers = 1
+
+        started_at = timezone.now()
+        for backend_name, backend in get_search_backends_with_name():
+            if options["backend"] not in (None, backend_name) or not backend.rebuilder_class:
+                continue
+
+            for index, models in group_models_by_index(backend, get_indexed_models()).items():
+                self.stdout.write(f"{backend_name}: rebuilding index {index}")
+                # Workers commit their own chunks, which an atomic rebuild can't span.
+                rebuilder_class = backend.rebuilder_class if workers == 1 else type(backend).rebuilder_class
+                rebuilder = rebuilder_class(index)
+                index = rebuilder.start()
+                for model in models:
+                    index.add_model(model)
+
+                jobs = [(model, chunk) for model in models for chunk in get_chunks(model, options["chunk_size"])]
+                if workers == 1:
+                    indexed = sum(index_chunk(index, model, chunk) for model, chunk in jobs)
+                else:
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        futures = [executor.submit(index_chunk_in_thread, index, *job) for job in jobs]
+                        indexed = sum(future.result() for future in futures)
+
+                rebuilder.finish()
+                self.stdout.write(f"{backend_name}: indexed {indexed} objects in {len(jobs)} chunk(s)")
+
+        # The rebuild covered everything saved before it started.
+        clear_index_queue(started_at)
+        bump_search_content_version()
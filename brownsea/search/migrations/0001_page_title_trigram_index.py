@@ -0,0 +1,30 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# Matches the UPPER(title::text) LIKE expressions that Django uses for icontains/istartswith.
+CREATE_INDEX = (
+    "CREATE INDEX IF NOT EXISTS brownsea_page_title_trgm "
+    "ON wagtailcore_page USING gin (UPPER(title::text) gin_trgm_ops)"
+)
+DROP_INDEX = "DROP INDEX IF EXISTS brownsea_page_title_trgm"
+
+
+def create_title_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_INDEX)
+
+
+def drop_title_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_INDEX)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wagtailcore", "0097_baselogentry_uuid_action_timestamp_indexes"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_title_index, drop_title_index),
+    ]
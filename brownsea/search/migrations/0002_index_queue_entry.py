@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:18
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("search", "0001_page_title_trigram_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IndexQueueEntry",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("object_id", models.CharField(max_length=255)),
+                ("queued_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="contenttypes.contenttype"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "index queue entries",
+                "indexes": [models.Index(fields=["queued_at"], name="search_indexqueue_queued_at")],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("content_type", "object_id"), name="search_indexqueue_unique_object"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+# The same indexes Wagtail's `enable_trigram` command creates, serving the trigram word
+# similarity lookups behind search suggestions.
+INDEXES = {
+    "modelsearch_title_text_trgm": "title_text",
+    "modelsearch_body_text_trgm": "body_text",
+}
+
+
+def create_text_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for name, column in INDEXES.items():
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS {name} ON wagtailsearch_indexentry USING gin ({column} gin_trgm_ops)"
+            )
+
+
+def drop_text_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for name in INDEXES:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("search", "0002_index_queue_entry"),
+        ("wagtailsearch", "0010_add_text_fields"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_text_indexes, drop_text_indexes),
+    ]
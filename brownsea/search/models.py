@@ -0,0 +1,21 @@
+from django.db import models
+from django.utils import timezone
+
+
+class IndexQueueEntry(models.Model):
+    """An object waiting for the search index worker to (re)index it."""
+
+    content_type = models.ForeignKey("contenttypes.ContentType", on_delete=models.CASCADE, related_name="+")
+    object_id = models.CharField(max_length=255)
+    # Saving the object again moves this on, so it isn't indexed until the edits settle.
+    queued_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["content_type", "object_id"], name="search_indexqueue_unique_object"),
+        ]
+        indexes = [models.Index(fields=["queued_at"], name="search_indexqueue_queued_at")]
+        verbose_name_plural = "index queue entries"
+
+    def __str__(self):
+        return f"{self.content_type_id}:{self.object_id}"
@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db.models import Q
+from wagtail.contrib.search_promotions.models import SearchPromotion
+from wagtail.search.utils import normalise_query_string
+
+from brownsea.search.cache import SEARCH_RESULTS_TIMEOUT, get_search_content_version
+
+SEARCH_PROMOTIONS_CACHE_PREFIX = "brownsea:search-promotions"
+
+
+@dataclass(frozen=True)
+class PromotedResult:
+    title: str
+    url: str
+    description: str
+
+
+def build_promotion_map() -> dict[str, list[PromotedResult]]:
+    """Map each promoted query to its pinned results, in the order editors gave them, in one query."""
+    promotion_map = {}
+    for promotion in (
+        SearchPromotion.objects.filter(Q(page__isnull=True) | Q(page__live=True))
+        .select_related("query", "page")
+        .order_by("query_id", "sort_order")
+    ):
+        url = promotion.page.get_url() if promotion.page else promotion.external_link_url
+        promotion_map.setdefault(promotion.query.query_string, []).append(
+            PromotedResult(title=promotion.title or url, url=url, description=promotion.description)
+        )
+    return promotion_map
+
+
+def get_promotion_map() -> dict[str, list[PromotedResult]]:
+    # Promotions show page titles and URLs, so they are rebuilt whenever the content changes.
+    key = f"{SEARCH_PROMOTIONS_CACHE_PREFIX}:{get_search_content_version()}"
+    promotion_map = cache.get(key)
+    if promotion_map is None:
+        promotion_map = build_promotion_map()
+        cache.set(key, promotion_map, SEARCH_RESULTS_TIMEOUT)
+    return promotion_map
+
+
+def get_promoted_results(query_string: str) -> list[PromotedResult]:
+    return get_promotion_map().get(normalise_query_string(query_string), [])
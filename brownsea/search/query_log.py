@@ -0,0 +1,54 @@
+from collections import Counter
+
+from django.db.models import Case, F, When
+from django.utils import timezone
+from wagtail.contrib.search_promotions.models import Query, QueryDailyHits
+from wagtail.search.utils import normalise_query_string
+
+from brownsea.core.buffers import BufferedCounter
+
+QUERY_LOG_FLUSH_BATCH_SIZE = 500
+
+
+class SearchQueryLog(BufferedCounter):
+    """
+    Counts searches in process, and adds them to the daily hits behind Wagtail's popular queries
+    in bulk from a background timer every APP_SEARCH_QUERY_LOG_FLUSH_SECONDS, so searching never
+    waits on a write.
+    """
+
+    flush_seconds_setting = "APP_SEARCH_QUERY_LOG_FLUSH_SECONDS"
+
+    def record(self, query_string: str) -> None:
+        query_string = normalise_query_string(query_string)
+        if query_string:
+            self.add((query_string, timezone.now().date()))
+
+    def write(self, counts: Counter) -> int:
+        query_strings = sorted({query_string for query_string, _ in counts})
+        Query.objects.bulk_create(
+            [Query(query_string=query_string) for query_string in query_strings],
+            ignore_conflicts=True,
+            batch_size=QUERY_LOG_FLUSH_BATCH_SIZE,
+        )
+        query_ids = dict(Query.objects.filter(query_string__in=query_strings).values_list("query_string", "pk"))
+        hits = {(query_ids[query_string], date): count for (query_string, date), count in counts.items()}
+
+        QueryDailyHits.objects.bulk_create(
+            [QueryDailyHits(query_id=query_id, date=date) for query_id, date in hits],
+            ignore_conflicts=True,
+            batch_size=QUERY_LOG_FLUSH_BATCH_SIZE,
+        )
+        updated = 0
+        for date in sorted({date for _, date in hits}):
+            query_ids_for_date = sorted(query_id for query_id, hit_date in hits if hit_date == date)
+            for start in range(0, len(query_ids_for_date), QUERY_LOG_FLUSH_BATCH_SIZE):
+                batch = query_ids_for_date[start : start + QUERY_LOG_FLUSH_BATCH_SIZE]
+                updated += QueryDailyHits.objects.filter(query_id__in=batch, date=date).update(
+                    hits=F("hits")
+                    + Case(*(When(query_id=query_id, then=hits[query_id, date]) for query_id in batch), default=0)
+                )
+        return updated
+
+
+search_query_log = SearchQueryLog()
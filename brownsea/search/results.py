@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+
+from django.conf import settings
+from wagtail.models import Page
+
+from brownsea.core.pagination import CountlessPaginator
+from brownsea.search.cache import get_search_hits
+from brownsea.search.facets import filter_hits, get_facets, get_selected_facets
+from brownsea.search.snippets import build_snippet, get_indexed_texts, get_query_terms
+from brownsea.search.suggestions import SUGGESTION_MAX_RESULTS, get_search_suggestion
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    """What a search results listing shows for a page, worked out once when the results are fetched."""
+
+    page: Page
+    title: str
+    url: str
+    introduction: str
+    # An excerpt with the query's terms highlighted, when the indexed body text contains them.
+    snippet: str = ""
+
+
+def get_search_results(page_ids, request=None, *, query="") -> list[SearchResult]:
+    """
+    Summarise a page of search hits, loading their specific pages in one query per page type
+    with StreamFields deferred, as listings never show a body. Snippets come from the text the
+    search index extracted, in one more query.
+    """
+    page_ids = list(page_ids)
+    pages = {page.pk: page for page in Page.objects.filter(pk__in=page_ids).defer_streamfields().specific()}
+    terms = get_query_terms(query)
+    texts = get_indexed_texts(pages.values()) if terms else {}
+
+    # Keep the search ranking.
+    return [
+        SearchResult(
+            page=page,
+            title=page.title,
+            url=page.get_url(request),
+            introduction=getattr(page, "introduction", ""),
+            snippet=build_snippet(texts.get(page.pk, ""), terms),
+        )
+        for page in (pages.get(page_id) for page_id in page_ids)
+        if page is not None
+    ]
+
+
+def paginate_search_results(page_ids, page_number, request=None, *, query=""):
+    """Return the requested page of the ranked ``page_ids``, with its hits summarised for display."""
+    # The ranked ids are already in memory, so their total is free.
+    paginator = CountlessPaginator(page_ids, settings.APP_SEARCH_RESULTS_PER_PAGE, count=len(page_ids))
+    results_page = paginator.get_page(page_number)
+    results_page.object_list = get_search_results(results_page.object_list, request, query=query)
+    return results_page
+
+
+def get_faceted_search_context(request, query, search, *, scope="", page_number=1) -> dict:
+    """Run ``search`` for ``query`` through the result cache and return its results and facets."""
+    hits, truncated = get_search_hits(query, search, scope=scope, request=request)
+    selected = get_selected_facets(request)
+    return {
+        "search_results": paginate_search_results(filter_hits(hits, selected), page_number, request, query=query),
+        # Counts are then only of the hits kept, so show them as a lower bound.
+        "search_results_truncated": truncated,
+        "search_facets": get_facets(hits, selected),
+        "selected_facets": selected,
+        # Few hits often means a misspelling.
+        "search_suggestion": get_search_suggestion(query, request) if len(hits) < SUGGESTION_MAX_RESULTS else "",
+    }
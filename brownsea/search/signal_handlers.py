@@ -0,0 +1,51 @@
+from django.db.models.signals import post_delete, post_save
+from modelsearch.index import get_indexed_models
+from wagtail.contrib.search_promotions.models import SearchPromotion
+from wagtail.models import Page
+from wagtail.signals import page_published, page_unpublished, post_page_move
+
+from brownsea.search.cache import bump_search_content_version
+from brownsea.search.indexing import (
+    get_queued_backend_names,
+    get_queued_backends,
+    queue_index_update,
+    remove_from_index,
+)
+
+
+def bump_search_version_on_change(sender, instance, **kwargs):
+    # Publishing also covers access level changes, which decide who can find a page.
+    if isinstance(instance, Page):
+        bump_search_content_version()
+
+
+def bump_search_version_on_promotion_change(sender, instance, **kwargs):
+    bump_search_content_version()
+
+
+def queue_index_update_on_save(sender, instance, **kwargs):
+    if not kwargs.get("raw") and get_queued_backend_names():
+        queue_index_update(instance)
+
+
+def remove_from_index_on_delete(sender, instance, **kwargs):
+    # Removing an entry is cheap, and leaving it until the worker runs would show deleted objects.
+    if backends := get_queued_backends():
+        remove_from_index(instance, backends)
+
+
+def register_signal_handlers():
+    for signal in (page_published, page_unpublished, post_page_move):
+        signal.connect(bump_search_version_on_change)
+    # Connected per model, as a receiver for every sender stops Django fast-deleting anything.
+    for model in get_indexed_models():
+        if issubclass(model, Page):
+            post_delete.connect(bump_search_version_on_change, sender=model)
+
+    for signal in (post_save, post_delete):
+        signal.connect(bump_search_version_on_promotion_change, sender=SearchPromotion)
+
+    for model in get_indexed_models():
+        if getattr(model, "search_auto_update", True):
+            post_save.connect(queue_index_update_on_save, sender=model)
+            post_delete.connect(remove_from_index_on_delete, sender=model)
@@ -0,0 +1,74 @@
+import re
+
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from wagtail.search.models import IndexEntry
+
+SNIPPET_LENGTH = 240
+# PostgreSQL keeps a plain text copy beside its tsvectors. The other backends store plain text.
+INDEXED_TEXT_FIELD = "body_text" if any(field.name == "body_text" for field in IndexEntry._meta.fields) else "body"
+
+
+def get_query_terms(query: str) -> list[str]:
+    return [term for term in re.findall(r"\w+", query.lower()) if len(term) > 1]
+
+
+def get_indexed_texts(pages) -> dict[int, str]:
+    """
+    Return the body text the search index extracted from each of ``pages`` when they were indexed,
+    by page id, in one query. StreamFields are never rendered here.
+    """
+    pages = list(pages)
+    if not pages:
+        return {}
+
+    content_type_ids = {page.pk: page.content_type_id for page in pages}
+    entries = IndexEntry.objects.filter(
+        content_type_id__in=set(content_type_ids.values()),
+        object_id__in=[str(page_id) for page_id in content_type_ids],
+    ).values_list("content_type_id", "object_id", INDEXED_TEXT_FIELD)
+    return {
+        int(object_id): text or ""
+        for content_type_id, object_id, text in entries
+        if content_type_ids.get(int(object_id)) == content_type_id
+    }
+
+
+def build_snippet(text: str, terms: list[str], *, length: int = SNIPPET_LENGTH) -> str:
+    """
+    Return an excerpt of ``text`` around the first of ``terms`` it contains, with every match
+    wrapped in ``<mark>``, or an empty string if none of them appear. Terms match the start of a
+    word, so "camp" highlights "camping" as the index's stemming would have found it.
+    """
+    if not text or not terms:
+        return ""
+
+    pattern = re.compile(r"\b(?:" + "|".join(re.escape(term) for term in terms) + r")\w*", re.IGNORECASE)
+    first_match = pattern.search(text)
+    if first_match is None:
+        return ""
+
+    # Start a little before the match, on a word boundary.
+    start = max(0, first_match.start() - length // 3)
+    if start:
+        boundary = text.find(" ", start, first_match.start())
+        if boundary >= 0:
+            start = boundary + 1
+    end = min(len(text), start + length)
+    if end < len(text):
+        boundary = text.rfind(" ", first_match.end(), end)
+        if boundary > 0:
+            end = boundary
+    excerpt = text[start:end]
+
+    parts = []
+    position = 0
+    for match in pattern.finditer(excerpt):
+        parts.append(escape(excerpt[position : match.start()]))
+        parts.append(f"<mark>{escape(match.group())}</mark>")
+        position = match.end()
+    parts.append(escape(excerpt[position:]))
+
+    prefix = "… " if start else ""
+    suffix = " …" if end < len(text) else ""
+    return mark_safe(prefix + "".join(parts).strip() + suffix)  # noqa: S308
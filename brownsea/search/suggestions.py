@@ -0,0 +1,148 @@
+import difflib
+import logging
+import re
+import time
+from contextlib import contextmanager
+from functools import reduce
+from operator import or_
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Case, IntegerField, Q, TextField, Value, When
+from django.db.models.functions import Cast, Greatest
+from wagtail.models import Page, get_page_models
+from wagtail.search.models import IndexEntry
+
+from brownsea.core.access import get_visibility_filter
+from brownsea.search.cache import SEARCH_RESULTS_TIMEOUT, get_search_cache_key, normalize_query
+
+logger = logging.getLogger(__name__)
+
+# Searches with fewer hits than this are checked for a likely misspelling.
+SUGGESTION_MAX_RESULTS = 3
+# The similarity lookup gives up rather than hold up a search for longer than this.
+SUGGESTION_BUDGET_MS = 150
+SUGGESTION_CANDIDATES = 10
+SUGGESTION_CUTOFF = 0.75
+MIN_WORD_LENGTH = 3
+
+
+def get_words(text: str) -> list[str]:
+    return [word for word in re.findall(r"\w+", text.lower()) if len(word) >= MIN_WORD_LENGTH]
+
+
+@contextmanager
+def query_time_budget(milliseconds: int):
+    """
+    Abort the queries run inside the block with a ``DatabaseError`` once ``milliseconds`` have
+    passed, using a statement timeout on PostgreSQL and a progress handler on SQLite.
+    """
+    if connection.vendor == "postgresql":
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SHOW statement_timeout")
+                previous = cursor.fetchone()[0]
+                cursor.execute("SELECT set_config('statement_timeout', %s, true)", [str(milliseconds)])
+            yield
+            # Inside an outer transaction this block is only a savepoint, and releasing it would keep
+            # the budget until the outer transaction ends. Rolling the savepoint back undoes it anyway.
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT set_config('statement_timeout', %s, true)", [previous])
+    elif connection.vendor == "sqlite":
+        connection.ensure_connection()
+        deadline = time.monotonic() + milliseconds / 1000
+        connection.connection.set_progress_handler(lambda: time.monotonic() > deadline, 100)
+        try:
+            yield
+        finally:
+            connection.connection.set_progress_handler(None, 0)
+    else:
+        yield
+
+
+def get_similar_texts(query: str, request) -> list[str]:
+    """
+    Return the titles, and on PostgreSQL the indexed body text, of the visible pages most similar
+    to ``query`` by trigrams. PostgreSQL uses the trigram indexes on the search index's plain text;
+    elsewhere titles are matched on their shared trigrams.
+    """
+    pages = Page.objects.live().filter(depth__gt=1).filter(get_visibility_filter(request))
+
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        # Images, documents and snippets share the index, with ids that can match a page's.
+        page_content_type_ids = [
+            content_type.pk for content_type in ContentType.objects.get_for_models(*get_page_models()).values()
+        ]
+        rows = (
+            IndexEntry.objects.filter(
+                Q(title_text__trigram_word_similar=query) | Q(body_text__trigram_word_similar=query),
+                content_type_id__in=page_content_type_ids,
+                object_id__in=pages.annotate(text_id=Cast("pk", TextField())).values("text_id"),
+            )
+            .annotate(
+                similarity=Greatest(
+                    TrigramWordSimilarity(query, "title_text"), TrigramWordSimilarity(query, "body_text")
+                )
+            )
+            .order_by("-similarity")
+            .values_list("title_text", "body_text")[:SUGGESTION_CANDIDATES]
+        )
+        return [text for row in rows for text in row]
+
+    trigrams = {word[i : i + 3] for word in get_words(query) for i in range(len(word) - 2)}
+    if not trigrams:
+        return []
+    shared = sum(
+        (
+            Case(When(title__icontains=trigram, then=Value(1)), default=Value(0), output_field=IntegerField())
+            for trigram in trigrams
+        ),
+        start=Value(0),
+    )
+    return list(
+        pages.filter(reduce(or_, (Q(title__icontains=trigram) for trigram in trigrams)))
+        .annotate(shared_trigrams=shared)
+        .filter(shared_trigrams__gte=len(trigrams) // 2)
+        .order_by("-shared_trigrams")
+        .values_list("title", flat=True)[:SUGGESTION_CANDIDATES]
+    )
+
+
+def correct_query(query: str, texts: list[str]) -> str:
+    """Replace each word of ``query`` missing from ``texts`` with the closest word they contain."""
+    vocabulary = {word for text in texts for word in get_words(text)}
+    corrected = []
+    for word in query.split():
+        if len(word) >= MIN_WORD_LENGTH and word not in vocabulary:
+            word = next(iter(difflib.get_close_matches(word, vocabulary, n=1, cutoff=SUGGESTION_CUTOFF)), word)
+        corrected.append(word)
+    return " ".join(corrected)
+
+
+def get_search_suggestion(query: str, request) -> str:
+    """
+    Return a corrected spelling of ``query`` built from the most similar page text, or an empty
+    string. Suggestions are cached like results, and a lookup that overruns its budget offers none.
+    """
+    query = normalize_query(query)
+    if not get_words(query):
+        return ""
+
+    key = get_search_cache_key(query, scope="suggestion", request=request)
+    suggestion = cache.get(key)
+    if suggestion is None:
+        try:
+            with query_time_budget(SUGGESTION_BUDGET_MS):
+                texts = get_similar_texts(query, request)
+        except DatabaseError:
+            # Try again next time, when the database may be less busy.
+            logger.warning("Search suggestion for %r ran out of time", query)
+            return ""
+        suggestion = correct_query(query, texts)
+        if suggestion == query:
+            suggestion = ""
+        cache.set(key, suggestion, SEARCH_RESULTS_TIMEOUT)
+    return suggestion
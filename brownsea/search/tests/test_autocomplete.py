@@ -0,0 +1,57 @@
+import pytest
+from django.urls import reverse
+
+from brownsea.core.models import PageAccessLevel
+from brownsea.factories import InfoPageFactory, publish
+
+
+def suggest(client, query, **params):
+    response = client.get(reverse("search_autocomplete"), {"query": query, **params})
+    assert response.status_code == 200
+    return [result["title"] for result in response.json()["results"]]
+
+
+@pytest.fixture
+def pages(site_tree):
+    home = site_tree["home"]
+    public = publish(
+        InfoPageFactory(parent=home, title="Camp kit", slug="camp-kit", access_level=PageAccessLevel.PUBLIC)
+    )
+    return {
+        "public": public,
+        "public-child": publish(InfoPageFactory(parent=public, title="Kit list for camp", slug="kit-list")),
+        "members": publish(InfoPageFactory(parent=home, title="Kit store rota", slug="kit-store")),
+    }
+
+
+@pytest.mark.django_db
+def test_suggestions_put_title_prefix_matches_first(authenticated_client, pages):
+    assert suggest(authenticated_client, "kit") == ["Kit store rota", "Kit list for camp", "Camp kit"]
+
+
+@pytest.mark.django_db
+def test_suggestions_match_every_word(authenticated_client, pages):
+    assert suggest(authenticated_client, "camp  KIT") == ["Camp kit", "Kit list for camp"]
+
+
+@pytest.mark.django_db
+def test_suggestions_only_include_pages_the_viewer_may_see(client, pages):
+    assert suggest(client, "kit") == ["Kit list for camp", "Camp kit"]
+
+
+@pytest.mark.django_db
+def test_suggestions_can_be_scoped_to_a_topic(authenticated_client, pages):
+    assert suggest(authenticated_client, "kit", scope=pages["public"].pk) == ["Kit list for camp", "Camp kit"]
+
+
+@pytest.mark.django_db
+def test_scopes_the_viewer_cannot_see_are_not_found(client, pages):
+    response = client.get(reverse("search_autocomplete"), {"query": "kit", "scope": pages["members"].pk})
+
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_short_prefixes_need_no_queries(client, django_assert_num_queries):
+    with django_assert_num_queries(0):
+        assert suggest(client, "k") == []
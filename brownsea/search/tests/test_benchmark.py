@@ -0,0 +1,32 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from brownsea.standard_pages.models import InfoPage
+
+
+@pytest.mark.django_db
+def test_benchmark_reports_both_backends_and_rolls_back(site_tree):
+    stdout = StringIO()
+
+    call_command("benchmark_search", "--pages=5", "--repeat=1", "--query=camp", stdout=stdout)
+
+    output = stdout.getvalue()
+    assert "configured" in output
+    assert "fallback" in output
+    assert not InfoPage.objects.exists()
+
+
+@pytest.mark.django_db
+def test_benchmark_indexes_the_corpus_when_index_updates_are_queued(site_tree, settings):
+    settings.WAGTAILSEARCH_BACKENDS = {
+        "default": {**settings.WAGTAILSEARCH_BACKENDS["default"], "AUTO_UPDATE": False},
+    }
+    stdout = StringIO()
+
+    # Every synthetic page is made of the benchmark's own vocabulary, so they all mention a tent.
+    call_command("benchmark_search", "--pages=5", "--repeat=1", "--query=tent", stdout=stdout)
+
+    rows = [line.split() for line in stdout.getvalue().splitlines()]
+    assert ["tent", "configured", "5"] in [row[:3] for row in rows]
@@ -0,0 +1,73 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from brownsea.factories import ArticlePageFactory, InfoPageFactory, NewsIndexPageFactory, NewsTypeFactory, publish
+from brownsea.search.facets import describe_hits
+
+
+@pytest.fixture
+def kit_pages(site_tree):
+    home = site_tree["home"]
+    news = publish(NewsIndexPageFactory(parent=home, title="Updates", slug="updates"))
+    camps = NewsTypeFactory(name="Camps", slug="camps")
+    training = NewsTypeFactory(name="Training", slug="training")
+    return [
+        publish(InfoPageFactory(parent=home, title="Kit list", slug="kit-list")),
+        publish(ArticlePageFactory(parent=news, title="Camp kit", slug="camp-kit", news_type=camps)),
+        publish(ArticlePageFactory(parent=news, title="Kit swap camp", slug="kit-swap", news_type=camps)),
+        publish(ArticlePageFactory(parent=news, title="Kit training", slug="kit-training", news_type=training)),
+    ]
+
+
+def get_counts(options):
+    return {option.value: option.count for option in options}
+
+
+@pytest.mark.django_db
+def test_facet_values_are_described_in_one_query(kit_pages, django_assert_num_queries):
+    page_ids = [page.pk for page in reversed(kit_pages)]
+
+    with django_assert_num_queries(1):
+        hits = describe_hits(page_ids)
+
+    assert [hit[0] for hit in hits] == page_ids
+    assert [hit[2] for hit in hits] == ["training", "camps", "camps", ""]
+
+
+@pytest.mark.django_db
+def test_search_counts_results_by_type_and_news_type(authenticated_client, kit_pages):
+    response = authenticated_client.get(reverse("search"), {"query": "kit"})
+
+    facets = response.context["search_facets"]
+    assert get_counts(facets["type"]) == {"infopage": 1, "articlepage": 3}
+    assert get_counts(facets["news_type"]) == {"camps": 2, "training": 1}
+
+
+@pytest.mark.django_db
+def test_search_results_can_be_narrowed_by_facet(authenticated_client, kit_pages):
+    response = authenticated_client.get(reverse("search"), {"query": "kit", "news_type": "camps"})
+
+    assert {result.page.slug for result in response.context["search_results"]} == {"camp-kit", "kit-swap"}
+    facets = response.context["search_facets"]
+    # Each facet's counts take the other facets' selections into account.
+    assert get_counts(facets["type"]) == {"articlepage": 2}
+    assert get_counts(facets["news_type"]) == {"camps": 2, "training": 1}
+    assert [option.value for option in facets["news_type"] if option.selected] == ["camps"]
+
+    response = authenticated_client.get(reverse("search"), {"query": "kit", "type": "infopage"})
+
+    assert [result.page.slug for result in response.context["search_results"]] == ["kit-list"]
+    assert get_counts(response.context["search_facets"]["news_type"]) == {}
+
+
+@pytest.mark.django_db
+def test_narrowing_by_facet_reuses_the_cached_hits(authenticated_client, kit_pages):
+    authenticated_client.get(reverse("search"), {"query": "kit"})
+
+    with CaptureQueriesContext(connection) as context:
+        authenticated_client.get(reverse("search"), {"query": "kit", "type": "articlepage"})
+
+    assert not [query for query in context.captured_queries if '"_score"' in query["sql"]]
+    assert not [query for query in context.captured_queries if "news_newstype" in query["sql"].lower()]
@@ -0,0 +1,95 @@
+from io import StringIO
+
+import pytest
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.db.models.signals import post_delete
+from wagtail.models import Page
+
+from brownsea.factories import InfoPageFactory, publish
+from brownsea.search.cache import get_search_content_version
+from brownsea.search.indexing import process_index_queue
+from brownsea.search.models import IndexQueueEntry
+
+
+@pytest.fixture
+def index_queue(settings):
+    settings.WAGTAILSEARCH_BACKENDS = {
+        "default": {**settings.WAGTAILSEARCH_BACKENDS["default"], "AUTO_UPDATE": False},
+    }
+
+
+def search_titles(query):
+    return {page.title for page in Page.objects.live().search(query)}
+
+
+@pytest.mark.django_db
+def test_saves_are_queued_once_and_indexed_by_the_worker(site_tree, index_queue):
+    page = publish(InfoPageFactory(parent=site_tree["home"], title="Camp kit", slug="camp-kit"))
+    page.title = "Camp kit list"
+    publish(page)
+
+    assert IndexQueueEntry.objects.count() == 1
+    assert search_titles("camp") == set()
+
+    assert process_index_queue(settle_seconds=0) == 1
+
+    assert search_titles("camp") == {"Camp kit list"}
+    assert not IndexQueueEntry.objects.exists()
+
+
+@pytest.mark.django_db
+def test_recently_saved_objects_wait_for_edits_to_settle(site_tree, index_queue):
+    publish(InfoPageFactory(parent=site_tree["home"], title="Camp kit", slug="camp-kit"))
+
+    assert process_index_queue(settle_seconds=60) == 0
+    assert IndexQueueEntry.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_deleted_pages_leave_the_index_straight_away(site_tree, index_queue):
+    page = publish(InfoPageFactory(parent=site_tree["home"], title="Camp kit", slug="camp-kit"))
+    process_index_queue(settle_seconds=0)
+
+    page.delete()
+
+    assert search_titles("camp") == set()
+    assert process_index_queue(settle_seconds=0) == 0
+
+
+@pytest.mark.django_db
+def test_worker_command_drains_the_queue_in_batches(site_tree, index_queue):
+    for i in range(3):
+        publish(InfoPageFactory(parent=site_tree["home"], title=f"Camp kit {i}", slug=f"camp-kit-{i}"))
+    stdout = StringIO()
+
+    call_command("process_search_index_queue", batch_size=2, settle_seconds=0, stdout=stdout)
+
+    assert "Processed 3 queued object(s)." in stdout.getvalue()
+    assert len(search_titles("camp")) == 3
+
+
+@pytest.mark.django_db
+def test_rebuild_indexes_everything_and_clears_the_queue(site_tree, index_queue):
+    for i in range(3):
+        publish(InfoPageFactory(parent=site_tree["home"], title=f"Camp kit {i}", slug=f"camp-kit-{i}"))
+
+    call_command("rebuild_search_index", chunk_size=2, workers=2, stdout=StringIO())
+
+    assert len(search_titles("camp")) == 3
+    assert not IndexQueueEntry.objects.exists()
+
+
+@pytest.mark.django_db
+def test_deleting_a_page_bumps_the_search_version(site_tree):
+    page = publish(InfoPageFactory(parent=site_tree["home"], title="Camp kit", slug="camp-kit"))
+    version = get_search_content_version()
+
+    page.delete()
+
+    assert get_search_content_version() != version
+
+
+def test_models_without_delete_receivers_can_still_be_fast_deleted():
+    # A post_delete receiver connected without a sender would apply to every model.
+    assert not post_delete.has_listeners(Session)
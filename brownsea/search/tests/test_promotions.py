@@ -0,0 +1,76 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from wagtail.contrib.search_promotions.models import Query, QueryDailyHits, SearchPromotion
+
+from brownsea.factories import InfoPageFactory, publish
+from brownsea.search.query_log import search_query_log
+
+
+def get_hits():
+    return dict(QueryDailyHits.objects.values_list("query__query_string", "hits"))
+
+
+@pytest.mark.django_db
+def test_searches_are_counted_in_memory_until_flushed(authenticated_client, site_tree):
+    for query in ("Kit list", "kit  LIST", "camp"):
+        authenticated_client.get(reverse("search"), {"query": query})
+    authenticated_client.get(reverse("search"), {"query": "camp", "page": 2})
+
+    assert not QueryDailyHits.objects.exists()
+
+    search_query_log.flush()
+
+    assert get_hits() == {"kit list": 2, "camp": 1}
+
+
+@pytest.mark.django_db
+def test_query_log_flushes_in_a_fixed_number_of_queries(site_tree, django_assert_num_queries):
+    search_query_log.record("camp")
+    search_query_log.flush()
+    for i in range(20):
+        search_query_log.record(f"query {i}")
+    search_query_log.record("camp")
+
+    with django_assert_num_queries(4):
+        assert search_query_log.flush() == 21
+
+    assert get_hits()["camp"] == 2
+
+
+@pytest.fixture
+def promoted_page(site_tree):
+    page = publish(InfoPageFactory(parent=site_tree["home"], title="Uniform shop", slug="uniform-shop"))
+    SearchPromotion.objects.create(query=Query.get("uniform"), page=page, description="Buy uniform here.")
+    return page
+
+
+def promotion_queries(context):
+    return [query for query in context.captured_queries if "searchpromotion" in query["sql"].lower()]
+
+
+@pytest.mark.django_db
+def test_promoted_results_are_served_from_the_cached_map(authenticated_client, promoted_page):
+    authenticated_client.get(reverse("search"), {"query": "Uniform"})
+
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_client.get(reverse("search"), {"query": "uniform"})
+
+    [promotion] = response.context["search_promotions"]
+    assert (promotion.title, promotion.url, promotion.description) == (
+        "Uniform shop",
+        promoted_page.url,
+        "Buy uniform here.",
+    )
+    assert not promotion_queries(context)
+
+
+@pytest.mark.django_db
+def test_editing_promotions_refreshes_the_map(authenticated_client, promoted_page):
+    authenticated_client.get(reverse("search"), {"query": "uniform"})
+
+    SearchPromotion.objects.all().delete()
+    response = authenticated_client.get(reverse("search"), {"query": "uniform"})
+
+    assert response.context["search_promotions"] == []
@@ -0,0 +1,51 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from brownsea.factories import InfoPageFactory, publish
+from brownsea.search.snippets import build_snippet
+
+
+def test_snippets_highlight_every_match_and_escape_the_text():
+    snippet = build_snippet("Bring <b>camping</b> kit to camp.", ["camp"])
+
+    assert snippet == "Bring &lt;b&gt;<mark>camping</mark>&lt;/b&gt; kit to <mark>camp</mark>."
+
+
+def test_snippets_are_cut_down_to_the_first_match():
+    text = " ".join(["filler"] * 100 + ["tent"] + ["filler"] * 100)
+
+    snippet = build_snippet(text, ["tent"], length=60)
+
+    assert snippet.startswith("… filler")
+    assert snippet.endswith("filler …")
+    assert "<mark>tent</mark>" in snippet
+    assert len(snippet) < 100
+
+
+def test_no_snippet_without_a_match():
+    assert build_snippet("Nothing to see here.", ["tent"]) == ""
+
+
+@pytest.mark.django_db
+def test_search_results_show_snippets_from_the_indexed_text(authenticated_client, site_tree):
+    publish(
+        InfoPageFactory(
+            parent=site_tree["home"],
+            title="Kit list",
+            slug="kit-list",
+            introduction="What to pack.",
+            body=[("text", "<p>Every patrol brings a <strong>tent</strong> and a stove.</p>")],
+        )
+    )
+
+    authenticated_client.get(reverse("search"), {"query": "tent"})  # Cache the search itself.
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_client.get(reverse("search"), {"query": "tent"})
+
+    [result] = response.context["search_results"]
+    assert "a <mark>tent</mark> and a stove" in result.snippet
+    assert b"<mark>tent</mark>" in response.content
+    # The snippet comes from the index entry, not from rendering the StreamField.
+    assert len([query for query in context.captured_queries if "indexentry" in query["sql"].lower()]) == 1
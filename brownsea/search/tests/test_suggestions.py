@@ -0,0 +1,99 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.urls import reverse
+from wagtail_factories import ImageFactory
+
+from brownsea.factories import InfoPageFactory, publish
+from brownsea.search import suggestions
+from brownsea.search.cache import get_search_cache_key
+from brownsea.search.suggestions import correct_query, get_similar_texts, query_time_budget
+
+
+def test_misspelt_words_are_corrected_from_similar_text():
+    assert correct_query("risk asessment", ["Risk assessment", "Kit list"]) == "risk assessment"
+
+
+def test_words_that_appear_are_left_alone():
+    assert correct_query("kit lists", ["Kit lists"]) == "kit lists"
+
+
+@pytest.fixture
+def risk_assessment(site_tree):
+    return publish(InfoPageFactory(parent=site_tree["home"], title="Risk assessment", slug="risk-assessment"))
+
+
+@pytest.mark.django_db
+def test_searches_with_few_results_offer_a_correction(authenticated_client, risk_assessment):
+    response = authenticated_client.get(reverse("search"), {"query": "risk asessment"})
+
+    assert response.context["search_suggestion"] == "risk assessment"
+    assert b"Did you mean" in response.content
+
+
+@pytest.mark.django_db
+def test_searches_that_find_enough_skip_the_suggestion(authenticated_client, risk_assessment, monkeypatch):
+    monkeypatch.setattr(suggestions, "get_similar_texts", pytest.fail)
+    monkeypatch.setattr("brownsea.search.results.SUGGESTION_MAX_RESULTS", 1)
+
+    response = authenticated_client.get(reverse("search"), {"query": "risk assessment"})
+
+    assert response.context["search_suggestion"] == ""
+
+
+@pytest.mark.django_db
+def test_suggestions_that_overrun_their_budget_are_abandoned(authenticated_client, risk_assessment, monkeypatch):
+    monkeypatch.setattr(suggestions, "SUGGESTION_BUDGET_MS", 0)
+
+    response = authenticated_client.get(reverse("search"), {"query": "risk asessment"})
+
+    assert response.context["search_suggestion"] == ""
+    # Nothing is cached, so the next search tries again.
+    assert cache.get(get_search_cache_key("risk asessment", scope="suggestion", request=response.wsgi_request)) is None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="Only PostgreSQL matches the search index's text")
+@pytest.mark.django_db
+def test_similar_texts_only_come_from_pages(authenticated_client, risk_assessment):
+    # An indexed image whose id is also a visible page's.
+    ImageFactory(pk=risk_assessment.pk, title="Risk assessors")
+    request = authenticated_client.get(reverse("search")).wsgi_request
+
+    texts = get_similar_texts("risk assessors", request)
+
+    assert "Risk assessment" in texts
+    assert "Risk assessors" not in texts
+
+
+def get_statement_timeout():
+    with connection.cursor() as cursor:
+        cursor.execute("SHOW statement_timeout")
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="statement_timeout is PostgreSQL only")
+@pytest.mark.django_db
+def test_time_budget_is_restored_inside_an_outer_transaction():
+    with transaction.atomic():
+        before = get_statement_timeout()
+        with query_time_budget(150):
+            assert get_statement_timeout() == "150ms"
+
+        assert get_statement_timeout() == before
+
+
+@pytest.mark.django_db
+def test_time_budget_leaves_later_queries_alone_inside_an_outer_transaction():
+    with transaction.atomic():
+        with query_time_budget(1):
+            pass
+
+        # Long enough to overrun a 1ms budget on any database.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "WITH RECURSIVE numbers(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM numbers WHERE n < 200000) "
+                "SELECT count(*) FROM numbers"
+            )
+            assert cursor.fetchone()[0] == 200000
@@ -1,6 +1,11 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from brownsea.factories import InfoPageFactory, publish
+from brownsea.standard_pages.models import InfoPage
+
 
 @pytest.mark.django_db
 def test_search_redirects_anonymous_users_to_login(client):
@@ -15,3 +20,85 @@ def test_authenticated_users_can_access_search(authenticated_client):
     response = authenticated_client.get(reverse("search"))
 
     assert response.status_code == 200
+
+
+def add_matching_pages(parent, count):
+    start = parent.get_children().count()
+    return [
+        publish(InfoPageFactory(parent=parent, title=f"Kit list {i}", slug=f"kit-list-{i}"))
+        for i in range(start, start + count)
+    ]
+
+
+@pytest.mark.django_db
+def test_search_results_are_summarised_from_specific_pages(authenticated_client, site_tree):
+    [page] = add_matching_pages(site_tree["home"], 1)
+
+    response = authenticated_client.get(reverse("search"), {"query": "kit"})
+
+    [result] = response.context["search_results"]
+    assert isinstance(result.page, InfoPage)
+    assert (result.title, result.url, result.introduction) == (page.title, page.url, page.introduction)
+
+
+@pytest.mark.django_db
+def test_search_results_cost_a_fixed_number_of_queries(authenticated_client, site_tree):
+    def search():
+        with CaptureQueriesContext(connection) as context:
+            response = authenticated_client.get(reverse("search"), {"query": "kit"})
+        assert len(response.context["search_results"]) == len(pages)
+        return len(context.captured_queries)
+
+    pages = add_matching_pages(site_tree["home"], 1)
+    search()  # Warm the site, URL and search caches.
+    queries = search()
+    pages += add_matching_pages(site_tree["home"], 5)
+    search()
+
+    assert search() == queries
+
+
+def search_index_queries(context):
+    # Ranked searches score their hits. Snippets read the index too, but don't rank.
+    return [query for query in context.captured_queries if '"_score"' in query["sql"]]
+
+
+@pytest.mark.django_db
+def test_repeated_and_paginated_searches_use_the_cached_ids(authenticated_client, site_tree, settings):
+    settings.APP_SEARCH_RESULTS_PER_PAGE = 2
+    add_matching_pages(site_tree["home"], 3)
+    authenticated_client.get(reverse("search"), {"query": "Kit  List"})
+
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_client.get(reverse("search"), {"query": "kit list", "page": 2})
+
+    assert len(response.context["search_results"]) == 1
+    assert not search_index_queries(context)
+
+
+@pytest.mark.django_db
+def test_publishing_invalidates_cached_search_results(authenticated_client, site_tree):
+    add_matching_pages(site_tree["home"], 1)
+    authenticated_client.get(reverse("search"), {"query": "kit"})
+
+    add_matching_pages(site_tree["home"], 1)
+    response = authenticated_client.get(reverse("search"), {"query": "kit"})
+
+    assert len(response.context["search_results"]) == 2
+
+
+@pytest.mark.django_db
+def test_searches_past_the_result_limit_say_there_are_more(authenticated_client, site_tree, monkeypatch):
+    monkeypatch.setattr("brownsea.search.cache.SEARCH_RESULTS_LIMIT", 2)
+    add_matching_pages(site_tree["home"], 3)
+
+    response = authenticated_client.get(reverse("search"), {"query": "kit"})
+
+    assert response.context["search_results_truncated"]
+    assert "2+ results found" in response.content.decode()
+
+    monkeypatch.setattr("brownsea.search.cache.SEARCH_RESULTS_LIMIT", 3)
+    response = authenticated_client.get(reverse("search"), {"query": "kit list"})
+
+    assert not response.context["search_results_truncated"]
+    assert "3 results found" in response.content.decode()
@@ -1,16 +1,15 @@
-from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
 from django.template.response import TemplateResponse
 from django.urls import reverse
 from wagtail.models import Page
 
-# To enable logging of search queries for use with the "Promoted search results" module
-# <https://docs.wagtail.org/en/stable/reference/contrib/searchpromotions.html>
-# uncomment the following line and the lines indicated in the search function
-# (after adding wagtail.contrib.search_promotions to INSTALLED_APPS):
-
-# from wagtail.contrib.search_promotions.models import Query
+from brownsea.core.access import get_visibility_filter
+from brownsea.search.autocomplete import get_title_suggestions
+from brownsea.search.promotions import get_promoted_results
+from brownsea.search.query_log import search_query_log
+from brownsea.search.results import get_faceted_search_context, paginate_search_results
 
 
 @login_required
@@ -20,31 +19,36 @@ def search(request):
 
     # Search
     if search_query:
-        search_results = Page.objects.live().search(search_query)
-
-        # To log this query for use with the "Promoted search results" module:
+        search_context = get_faceted_search_context(request, search_query, Page.objects.live().search, page_number=page)
+        search_context["search_promotions"] = get_promoted_results(search_query)
 
-        # query = Query.get(search_query)
-        # query.add_hit()
+        # Count searches for the "Promoted search results" popular queries, but not paging through them.
+        if "page" not in request.GET:
+            search_query_log.record(search_query)
 
     else:
-        search_results = Page.objects.none()
-
-    # Pagination
-    paginator = Paginator(search_results, settings.APP_SEARCH_RESULTS_PER_PAGE)
-    try:
-        search_results = paginator.page(page)
-    except PageNotAnInteger:
-        search_results = paginator.page(1)
-    except EmptyPage:
-        search_results = paginator.page(paginator.num_pages)
+        search_context = {"search_results": paginate_search_results([], page, request)}
 
     return TemplateResponse(
         request,
         "pages/search/search.html",
         {
             "search_query": search_query,
-            "search_results": search_results,
+            **search_context,
             "search_url": reverse("search"),
         },
     )
+
+
+def autocomplete(request):
+    # Unlike the search page this is open to everyone, as topic pages can be public. Suggestions
+    # are limited to the pages the viewer may see.
+    scope = None
+    scope_id = request.GET.get("scope", "")
+    if scope_id:
+        if not scope_id.isdigit():
+            return JsonResponse({"results": []}, status=400)
+        scope = get_object_or_404(Page.objects.live().filter(get_visibility_filter(request)), pk=scope_id)
+
+    suggestions = get_title_suggestions(request.GET.get("query", ""), request, scope=scope)
+    return JsonResponse({"results": [{"title": page.title, "url": page.get_url(request)} for page in suggestions]})
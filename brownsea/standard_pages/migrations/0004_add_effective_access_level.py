@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("standard_pages", "0003_add_page_access_level"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="indexpage",
+            name="access_source_path",
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="indexpage",
+            name="effective_access_level",
+            field=models.CharField(
+                choices=[
+                    ("inherit", "Inherit"),
+                    ("logged_in", "Logged in only"),
+                    ("magic_link", "Magic link"),
+                    ("public", "Public"),
+                ],
+                db_index=True,
+                default="logged_in",
+                editable=False,
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="infopage",
+            name="access_source_path",
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="infopage",
+            name="effective_access_level",
+            field=models.CharField(
+                choices=[
+                    ("inherit", "Inherit"),
+                    ("logged_in", "Logged in only"),
+                    ("magic_link", "Magic link"),
+                    ("public", "Public"),
+                ],
+                db_index=True,
+                default="logged_in",
+                editable=False,
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="processpage",
+            name="access_source_path",
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="processpage",
+            name="effective_access_level",
+            field=models.CharField(
+                choices=[
+                    ("inherit", "Inherit"),
+                    ("logged_in", "Logged in only"),
+                    ("magic_link", "Magic link"),
+                    ("public", "Public"),
+                ],
+                db_index=True,
+                default="logged_in",
+                editable=False,
+                max_length=20,
+            ),
+        ),
+    ]
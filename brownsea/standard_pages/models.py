@@ -3,7 +3,7 @@ from wagtail.admin.panels import FieldPanel
 from wagtail.search import index
 
 from brownsea.core.blocks import ProcessPageBlock, StoryBlock
-from brownsea.core.models import AbstractIndexPage, BasePage, InPageNavMixin
+from brownsea.core.models import INTRODUCTION_SEARCH_BOOST, AbstractIndexPage, BasePage, InPageNavMixin
 from brownsea.core.utils import StreamField
 
 
@@ -28,7 +28,7 @@ class InfoPage(InPageNavMixin, BasePage):
     ]
 
     search_fields = BasePage.search_fields + [
-        index.SearchField("introduction"),
+        index.SearchField("introduction", boost=INTRODUCTION_SEARCH_BOOST),
         index.SearchField("body"),
     ]
 
@@ -48,6 +48,6 @@ class ProcessPage(BasePage):
     ]
 
     search_fields = BasePage.search_fields + [
-        index.SearchField("introduction"),
+        index.SearchField("introduction", boost=INTRODUCTION_SEARCH_BOOST),
         index.SearchField("body"),
     ]
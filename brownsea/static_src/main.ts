@@ -9,6 +9,7 @@ import 'photoswipe/style.css';
 import './scss/main.scss';
 import MermaidInitialiser from './mermaid';
 import './magic_link_share';
+import './search_autocomplete';
 import './calendar'; // Import web component (auto-registers)
 
 // Initialise PhotoSwipe
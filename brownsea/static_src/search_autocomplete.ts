@@ -0,0 +1,81 @@
+interface Suggestion {
+    title: string;
+    url: string;
+}
+
+const DEBOUNCE_MS = 150;
+
+function initialiseAutocomplete(input: HTMLInputElement): void {
+    const url = input.dataset.autocompleteUrl;
+    if (!url) {
+        return;
+    }
+
+    const list = document.createElement('div');
+    list.className = 'dropdown-menu w-100';
+    list.setAttribute('role', 'listbox');
+    input.closest('.input-group')?.classList.add('position-relative');
+    input.insertAdjacentElement('afterend', list);
+
+    let timer: number | undefined;
+    let controller: AbortController | null = null;
+
+    function hide(): void {
+        list.classList.remove('show');
+        list.replaceChildren();
+    }
+
+    function show(suggestions: Suggestion[]): void {
+        list.replaceChildren(
+            ...suggestions.map((suggestion) => {
+                const item = document.createElement('a');
+                item.className = 'dropdown-item';
+                item.href = suggestion.url;
+                item.textContent = suggestion.title;
+                item.setAttribute('role', 'option');
+                return item;
+            }),
+        );
+        list.classList.toggle('show', suggestions.length > 0);
+    }
+
+    input.addEventListener('input', () => {
+        window.clearTimeout(timer);
+        const query = input.value.trim();
+        if (query.length < 2) {
+            hide();
+            return;
+        }
+
+        timer = window.setTimeout(() => {
+            controller?.abort();
+            controller = new AbortController();
+            const requestUrl = new URL(url, window.location.origin);
+            requestUrl.searchParams.set('query', query);
+
+            fetch(requestUrl, { credentials: 'same-origin', signal: controller.signal })
+                .then((response) => (response.ok ? response.json() : { results: [] }))
+                .then((data: { results: Suggestion[] }) => show(data.results))
+                .catch(() => undefined);
+        }, DEBOUNCE_MS);
+    });
+
+    input.addEventListener('keydown', (event) => {
+        if (event.key === 'Escape') {
+            hide();
+        } else if (event.key === 'ArrowDown' && list.classList.contains('show')) {
+            event.preventDefault();
+            list.querySelector<HTMLAnchorElement>('.dropdown-item')?.focus();
+        }
+    });
+
+    input.form?.addEventListener('focusout', (event) => {
+        if (!input.form?.contains(event.relatedTarget as Node | null)) {
+            hide();
+        }
+    });
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    document.querySelectorAll<HTMLInputElement>('input[data-autocomplete-url]').forEach(initialiseAutocomplete);
+});
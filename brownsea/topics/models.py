@@ -1,14 +1,14 @@
-from django.conf import settings
-from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 from django.db import models
 from wagtail.admin.panels import FieldPanel, MultiFieldPanel
 from wagtail.models import Page
 from wagtail.search import index
 
+from brownsea.core.access import get_visibility_filter
 from brownsea.core.blocks import LinkSectionBlock, TopicPageBlock
-from brownsea.core.models import BasePage
+from brownsea.core.models import INTRODUCTION_SEARCH_BOOST, BasePage
 from brownsea.core.utils import StreamField
 from brownsea.news.mixins import RecentNewsMixin
+from brownsea.search.results import get_faceted_search_context
 
 
 class TopicPage(RecentNewsMixin, BasePage):
@@ -44,10 +44,13 @@ class TopicPage(RecentNewsMixin, BasePage):
     ]
 
     search_fields = BasePage.search_fields + [
-        index.SearchField("introduction"),
+        index.SearchField("introduction", boost=INTRODUCTION_SEARCH_BOOST),
         index.SearchField("body"),
     ]
 
+    def get_recent_news_card_context(self) -> dict:
+        return {"article_type_plural": self.news_content_type_plural}
+
     def get_context(self, request):
         context = super().get_context(request)
 
@@ -56,30 +59,32 @@ class TopicPage(RecentNewsMixin, BasePage):
         page_number = request.GET.get("page", 1)
 
         if search_query:
-            search_results = self.search_within_topic(search_query)
-            paginator = Paginator(search_results, settings.APP_SEARCH_RESULTS_PER_PAGE)
-            try:
-                search_results = paginator.page(page_number)
-            except PageNotAnInteger:
-                search_results = paginator.page(1)
-            except EmptyPage:
-                search_results = paginator.page(paginator.num_pages)
-
             context["search_query"] = search_query
-            context["search_results"] = search_results
+            context.update(
+                get_faceted_search_context(
+                    request,
+                    search_query,
+                    lambda query: self.search_within_topic(query, request),
+                    scope=self.path,
+                    page_number=page_number,
+                )
+            )
         else:
             context["search_query"] = None
             context["search_results"] = None
 
         return context
 
-    def search_within_topic(self, query):
+    def search_within_topic(self, query, request=None):
         """
         Search within this topic page and all its descendant pages.
-        Returns a queryset of pages that match the search query.
+        Returns a queryset of pages that match the search query, limited to those
+        the viewer of ``request`` may see when given.
         """
         # Get all descendant pages (this page and all its children, grandchildren, etc.)
         descendant_pages = Page.objects.descendant_of(self, inclusive=True).live()
+        if request is not None:
+            descendant_pages = descendant_pages.filter(get_visibility_filter(request))
 
         # Perform search on descendant pages
         search_results = descendant_pages.search(query)
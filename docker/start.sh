@@ -9,5 +9,7 @@ export DJANGO_SETTINGS_MODULE=brownsea.core.settings.production
 cd /app
 
 python /app/manage.py migrate
+python /app/manage.py createcachetable
+python /app/manage.py backfill_page_access
 
 granian --interface wsgi brownsea.core.wsgi:application --workers 2 --host 0.0.0.0 --port 8000